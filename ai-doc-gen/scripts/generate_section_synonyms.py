@@ -7,19 +7,52 @@ This script creates a comprehensive synonym dictionary for improved matching.
 import json
 import sys
 import os
+import tempfile
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from ai_doc_gen.utils.llm import llm_utility
 
 
+def read_json(path: str):
+    """Load a JSON file in binary mode, using orjson when available."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def write_json_atomic(path: str, data) -> None:
+    """Write JSON to a temp file beside ``path`` and rename it into place.
+
+    Readers never see a half-written dictionary, even if the run is interrupted.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(dir=directory, prefix=os.path.basename(path) + '.',
+                                     suffix='.tmp', delete=False) as tmp:
+        tmp.write(payload)
+    try:
+        os.replace(tmp.name, path)
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
 def load_template_sections(template_path: str) -> list:
     """Load template section titles from the template file."""
     try:
-        with open(template_path, 'r') as f:
-            template = json.load(f)
+        template = read_json(template_path)
         
         # Extract section titles from template structure
         sections = template.get('template_structure', {}).get('section_hierarchy', [])
@@ -75,8 +108,7 @@ def generate_synonym_dictionary(template_path: str, output_path: str = "section_
         print(f"     ✅ Found {len(synonyms)} synonyms: {synonyms}")
     
     # Save the complete dictionary
-    with open(output_path, 'w') as f:
-        json.dump(synonym_dict, f, indent=2)
+    write_json_atomic(output_path, synonym_dict)
     
     print(f"\n✅ Synonym dictionary saved to: {output_path}")
     print(f"📊 Summary:")
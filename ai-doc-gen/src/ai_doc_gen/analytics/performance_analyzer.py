@@ -123,8 +123,39 @@ class PerformanceAnalyzer:
         # Update processing history
         self._update_processing_history(metric)
     
+    def record_batch(self, results: List[Dict[str, Any]]):
+        """
+        Record several processing results with a single write per data file.
+        
+        Each entry takes the same keys as record_processing_result.
+        """
+        if not results:
+            return
+        
+        timestamp = datetime.now().isoformat()
+        for result in results:
+            metric = {
+                'timestamp': timestamp,
+                'file_path': result['file_path'],
+                'file_type': result['file_type'],
+                'processing_time': result['processing_time'],
+                'success': result['success'],
+                'error': result.get('error'),
+                'metadata': result.get('metadata') or {}
+            }
+            self.metrics.append(metric)
+            self._apply_to_processing_history(metric)
+        
+        self._save_metrics()
+        self._save_processing_history()
+    
     def _update_processing_history(self, metric: Dict[str, Any]):
         """Update processing history with new metric."""
+        self._apply_to_processing_history(metric)
+        self._save_processing_history()
+    
+    def _apply_to_processing_history(self, metric: Dict[str, Any]):
+        """Fold a metric into the in-memory processing history."""
         # Group by date for trend analysis
         date_key = metric['timestamp'][:10]  # YYYY-MM-DD
         
@@ -164,8 +195,6 @@ class PerformanceAnalyzer:
                 'file_type_distribution': {metric['file_type']: 1}
             }
             self.processing_history.append(new_entry)
-        
-        self._save_processing_history()
     
     def get_performance_summary(self, days: int = 30) -> ProcessingStats:
         """Get performance summary for the specified number of days."""
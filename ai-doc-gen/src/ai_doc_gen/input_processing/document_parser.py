@@ -7,6 +7,7 @@ codebase but enhanced for multi-format support.
 """
 
 import logging
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -62,6 +63,14 @@ class ParsedDocument(BaseModel):
 class DocumentParser(ABC):
     """Abstract base class for document parsers."""
 
+    # Lowercase file extensions handled by the parser, and its display name
+    extensions: frozenset = frozenset()
+    format_name: str = ""
+
+    def _has_supported_extension(self, file_path: str) -> bool:
+        """Check the file extension with a single split and set lookup."""
+        return os.path.splitext(file_path)[1].lower() in self.extensions
+
     @abstractmethod
     def can_parse(self, file_path: str) -> bool:
         """Check if this parser can handle the given file."""
@@ -80,10 +89,13 @@ class DocumentParser(ABC):
 class PDFParser(DocumentParser):
     """PDF document parser using pdfplumber."""
 
+    extensions = frozenset({'.pdf'})
+    format_name = "PDF"
+
     def can_parse(self, file_path: str) -> bool:
         """Check if file is a PDF."""
         return (PDF_AVAILABLE and
-                Path(file_path).suffix.lower() == '.pdf' and
+                self._has_supported_extension(file_path) and
                 Path(file_path).exists())
 
     def parse(self, file_path: str) -> ParsedDocument:
@@ -273,10 +285,13 @@ class PDFParser(DocumentParser):
 class DOCXParser(DocumentParser):
     """DOCX document parser using python-docx."""
 
+    extensions = frozenset({'.docx', '.doc'})
+    format_name = "DOCX"
+
     def can_parse(self, file_path: str) -> bool:
         """Check if file is a DOCX."""
         return (DOCX_AVAILABLE and
-                Path(file_path).suffix.lower() in ['.docx', '.doc'] and
+                self._has_supported_extension(file_path) and
                 Path(file_path).exists())
 
     def parse(self, file_path: str) -> ParsedDocument:
@@ -411,10 +426,13 @@ class DOCXParser(DocumentParser):
 class XMLParser(DocumentParser):
     """XML document parser using ElementTree."""
 
+    extensions = frozenset({'.xml'})
+    format_name = "XML"
+
     def can_parse(self, file_path: str) -> bool:
         """Check if file is an XML."""
         return (XML_AVAILABLE and
-                Path(file_path).suffix.lower() == '.xml' and
+                self._has_supported_extension(file_path) and
                 Path(file_path).exists())
 
     def parse(self, file_path: str) -> ParsedDocument:
@@ -510,10 +528,13 @@ class XMLParser(DocumentParser):
 class HTMLParser(DocumentParser):
     """HTML document parser using BeautifulSoup."""
 
+    extensions = frozenset({'.html', '.htm'})
+    format_name = "HTML"
+
     def can_parse(self, file_path: str) -> bool:
         """Check if file is an HTML file."""
         return (HTML_AVAILABLE and
-                Path(file_path).suffix.lower() in ['.html', '.htm'] and
+                self._has_supported_extension(file_path) and
                 Path(file_path).exists())
 
     def parse(self, file_path: str) -> ParsedDocument:
@@ -866,9 +887,12 @@ class HTMLParser(DocumentParser):
 class TextParser(DocumentParser):
     """Plain text document parser."""
 
+    extensions = frozenset({'.txt'})
+    format_name = "TXT"
+
     def can_parse(self, file_path: str) -> bool:
         """Check if file is a text file."""
-        return (Path(file_path).suffix.lower() == '.txt' and
+        return (self._has_supported_extension(file_path) and
                 Path(file_path).exists())
 
     def parse(self, file_path: str) -> ParsedDocument:
@@ -967,7 +991,7 @@ class DocumentParserFactory:
     """Factory for creating appropriate document parsers."""
 
     def __init__(self):
-        """Initialize available parsers."""
+        """Initialize available parsers and index them by file extension."""
         self.parsers = []
 
         if PDF_AVAILABLE:
@@ -982,11 +1006,17 @@ class DocumentParserFactory:
         # Always add text parser
         self.parsers.append(TextParser())
 
+        # One dict lookup per file instead of asking every parser in turn
+        self._by_ext: Dict[str, DocumentParser] = {}
+        for parser in self.parsers:
+            for ext in parser.extensions:
+                self._by_ext.setdefault(ext, parser)
+
     def get_parser(self, file_path: str) -> Optional[DocumentParser]:
         """Get appropriate parser for the given file."""
-        for parser in self.parsers:
-            if parser.can_parse(file_path):
-                return parser
+        parser = self._by_ext.get(os.path.splitext(file_path)[1].lower())
+        if parser is not None and parser.can_parse(file_path):
+            return parser
         return None
 
     def parse_document(self, file_path: str) -> ParsedDocument:
@@ -999,19 +1029,7 @@ class DocumentParserFactory:
 
     def get_supported_formats(self) -> List[str]:
         """Get list of supported file formats."""
-        formats = []
-        for parser in self.parsers:
-            if isinstance(parser, PDFParser):
-                formats.append("PDF")
-            elif isinstance(parser, DOCXParser):
-                formats.append("DOCX")
-            elif isinstance(parser, XMLParser):
-                formats.append("XML")
-            elif isinstance(parser, HTMLParser):
-                formats.append("HTML")
-            elif isinstance(parser, TextParser):
-                formats.append("TXT")
-        return formats
+        return [parser.format_name for parser in self.parsers]
 
 # Convenience function
 def parse_document(file_path: str) -> ParsedDocument:
@@ -23,6 +23,14 @@ class ValidationLevel(Enum):
     ERROR = "error"
     CRITICAL = "critical"
 
+# Score penalty per issue, by severity
+LEVEL_PENALTIES = {
+    ValidationLevel.INFO: 0.05,
+    ValidationLevel.WARNING: 0.15,
+    ValidationLevel.ERROR: 0.4,
+    ValidationLevel.CRITICAL: 0.8
+}
+
 class ValidationIssue(BaseModel):
     """Represents a validation issue found in a document."""
     level: ValidationLevel
@@ -237,21 +245,13 @@ class InputValidator:
 
     def _calculate_duplicate_ratio(self, text: str) -> float:
         """Calculate the ratio of duplicate content."""
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = [line for line in map(str.strip, text.split('\n')) if line]
         if not lines:
             return 0.0
 
-        # Count duplicate lines
-        seen_lines = set()
-        duplicates = 0
-
-        for line in lines:
-            if line in seen_lines:
-                duplicates += 1
-            else:
-                seen_lines.add(line)
-
-        return duplicates / len(lines) if lines else 0.0
+        # Every occurrence beyond the first of a line counts as a duplicate
+        duplicates = len(lines) - len(set(lines))
+        return duplicates / len(lines)
 
     def _check_common_issues(self, text: str) -> List[ValidationIssue]:
         """Check for common document quality issues."""
@@ -314,21 +314,8 @@ class InputValidator:
         if not issues:
             return 1.0
 
-        # Weight issues by severity
-        weights = {
-            ValidationLevel.INFO: 0.05,
-            ValidationLevel.WARNING: 0.15,
-            ValidationLevel.ERROR: 0.4,
-            ValidationLevel.CRITICAL: 0.8
-        }
-
-        total_penalty = 0.0
-        for issue in issues:
-            penalty = weights.get(issue.level, 0.1)
-            total_penalty += penalty
-
-        # Cap penalty at 1.0
-        total_penalty = min(total_penalty, 1.0)
+        # Weight issues by severity, capping the penalty at 1.0
+        total_penalty = min(sum(LEVEL_PENALTIES.get(issue.level, 0.1) for issue in issues), 1.0)
 
         return max(0.0, 1.0 - total_penalty)
 
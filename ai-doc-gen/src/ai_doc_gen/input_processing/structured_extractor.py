@@ -6,15 +6,34 @@ for hardware documentation with focus on technical specifications, procedures,
 and requirements.
 """
 
+import hashlib
 import logging
 import re
+import sys
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, field_validator
 
 logger = logging.getLogger(__name__)
 
+# Optional Aho-Corasick automaton for single-pass keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Measurement tags: length, weight, electrical and storage units in one alternation,
+# so a text is scanned once rather than once per unit family
+_MEASUREMENT_RE = re.compile(
+    r'\b\d+(?:\.\d+)?\s*(?:mm|cm|m|inch|ft|kg|lb|g|V|A|W|Hz|GB|MB|TB)\b',
+    re.IGNORECASE
+)
+
+# Classification results kept per extractor before the memo is reset
+CLASSIFY_CACHE_SIZE = 10000
+
 class ContentType(Enum):
     """Types of content that can be extracted."""
     TECHNICAL_SPEC = "technical_specification"
@@ -29,7 +48,13 @@ class ContentType(Enum):
     TROUBLESHOOTING = "troubleshooting"
 
 class ExtractedContent(BaseModel):
-    """Structured representation of extracted content."""
+    """Structured representation of extracted content.
+
+    Instances are frozen so they can be shared safely between agents and
+    tests; use ``model_copy(update=...)`` to derive a modified item.
+    """
+    model_config = ConfigDict(frozen=True)
+
     content_type: ContentType
     title: str
     content: str
@@ -38,6 +63,12 @@ class ExtractedContent(BaseModel):
     metadata: Dict[str, Any] = {}
     tags: List[str] = []
 
+    @field_validator('source_section')
+    @classmethod
+    def _intern_source_section(cls, value: str) -> str:
+        """Share one string per heading across the many items cut from a section."""
+        return sys.intern(value)
+
 class StructuredExtractor:
     """Extracts structured content from parsed documents."""
 
@@ -45,6 +76,7 @@ class StructuredExtractor:
         """Initialize the extractor with patterns and rules."""
         self._init_patterns()
         self._init_keywords()
+        self._classify_cache: Dict[tuple, Optional[ExtractedContent]] = {}
 
     def _init_patterns(self):
         """Initialize regex patterns for content identification."""
@@ -99,6 +131,12 @@ class StructuredExtractor:
             ]
         }
 
+        # Compile once per extractor; classification runs these for every text block
+        self._compiled_patterns = {
+            content_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for content_type, patterns in self.patterns.items()
+        }
+
     def _init_keywords(self):
         """Initialize keyword mappings for content classification."""
         self.keywords = {
@@ -120,6 +158,38 @@ class StructuredExtractor:
             }
         }
 
+        # Technical terms reported as tags
+        self.technical_terms = [
+            'cisco', 'router', 'switch', 'firewall', 'server',
+            'ethernet', 'fiber', 'copper', 'wireless', 'bluetooth',
+            'usb', 'hdmi', 'vga', 'serial', 'parallel'
+        ]
+
+        # Flat (keyword, weight) table per content type, so scoring is one loop
+        self._keyword_weights = {
+            content_type: tuple((keyword, 0.05) for keywords in categories.values()
+                                for keyword in keywords)
+            for content_type, categories in self.keywords.items()
+        }
+
+        # One matcher over every keyword and tag term, so a text is scanned once
+        terms = {keyword for categories in self.keywords.values()
+                 for keywords in categories.values() for keyword in keywords}
+        terms.update(self.technical_terms)
+        self._all_terms = frozenset(terms)
+        self._term_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._term_automaton = ahocorasick.Automaton()
+            for term in self._all_terms:
+                self._term_automaton.add_word(term, term)
+            self._term_automaton.make_automaton()
+
+    def _find_terms(self, text_lower: str) -> frozenset:
+        """Return every keyword or technical term occurring in lowercased text."""
+        if self._term_automaton is not None:
+            return frozenset(term for _, term in self._term_automaton.iter(text_lower))
+        return frozenset(term for term in self._all_terms if term in text_lower)
+
     def extract_structured_content(self, parsed_document) -> List[ExtractedContent]:
         """Extract structured content from a parsed document."""
         extracted_content = []
@@ -149,8 +219,7 @@ class StructuredExtractor:
         # Analyze heading for content type
         heading_content = self._classify_content(heading, heading)
         if heading_content:
-            heading_content.source_section = heading
-            extracted.append(heading_content)
+            extracted.append(heading_content.model_copy(update={'source_section': sys.intern(heading)}))
 
         # Analyze content lines
         content_text = '\n'.join(content_lines)
@@ -176,34 +245,55 @@ class StructuredExtractor:
         return extracted
 
     def _classify_content(self, text: str, context: str) -> Optional[ExtractedContent]:
+        """Classify and extract content from text, reusing earlier results.
+
+        Results are immutable, so a repeated (text, context) pair returns the
+        same ExtractedContent (or None) without rescanning the text.
+        """
+        key = (hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), context)
+        try:
+            return self._classify_cache[key]
+        except KeyError:
+            pass
+
+        result = self._classify_content_uncached(text, context)
+        if len(self._classify_cache) >= CLASSIFY_CACHE_SIZE:
+            self._classify_cache.clear()
+        self._classify_cache[key] = result
+        return result
+
+    def _classify_content_uncached(self, text: str, context: str) -> Optional[ExtractedContent]:
         """Classify and extract content from text."""
         if not text.strip():
             return None
 
+        # Lowercase and scan for terms once; every scorer and tagger below reuses the result
+        found_terms = self._find_terms(text.lower())
+
         # Prioritize warning patterns
-        for pattern in self.patterns[ContentType.WARNING]:
-            if re.search(pattern, text, re.IGNORECASE):
+        for pattern in self._compiled_patterns[ContentType.WARNING]:
+            if pattern.search(text):
                 return ExtractedContent(
                     content_type=ContentType.WARNING,
                     title=self._extract_title(text),
                     content=text,
                     confidence=0.8,
                     source_section=context,
-                    tags=self._extract_tags(text, ContentType.WARNING)
+                    tags=self._extract_tags(text, ContentType.WARNING, found_terms)
                 )
 
         # Score each content type
         scores = {}
-        for content_type, patterns in self.patterns.items():
+        for content_type, patterns in self._compiled_patterns.items():
             if content_type == ContentType.WARNING:
                 continue  # Already handled
             score = 0
             for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
+                matches = pattern.findall(text)
                 score += len(matches) * 0.1
 
             # Additional scoring based on keywords
-            keyword_score = self._calculate_keyword_score(text, content_type)
+            keyword_score = self._calculate_keyword_score(text, content_type, found_terms)
             score += keyword_score
 
             scores[content_type] = score
@@ -218,23 +308,24 @@ class StructuredExtractor:
                     content=text,
                     confidence=min(best_type[1], 1.0),
                     source_section=context,
-                    tags=self._extract_tags(text, best_type[0])
+                    tags=self._extract_tags(text, best_type[0], found_terms)
                 )
 
         return None
 
-    def _calculate_keyword_score(self, text: str, content_type: ContentType) -> float:
+    def _calculate_keyword_score(self, text: str, content_type: ContentType,
+                                 found_terms: Optional[frozenset] = None) -> float:
         """Calculate score based on keyword presence."""
         if content_type not in self.keywords:
             return 0.0
 
-        score = 0.0
-        text_lower = text.lower()
+        if found_terms is None:
+            found_terms = self._find_terms(text.lower())
 
-        for category, keywords in self.keywords[content_type].items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    score += 0.05
+        score = 0.0
+        for keyword, weight in self._keyword_weights[content_type]:
+            if keyword in found_terms:
+                score += weight
 
         return score
 
@@ -251,36 +342,17 @@ class StructuredExtractor:
         words = text.split()[:5]
         return ' '.join(words) + ('...' if len(text.split()) > 5 else '')
 
-    def _extract_tags(self, text: str, content_type: ContentType) -> List[str]:
+    def _extract_tags(self, text: str, content_type: ContentType,
+                      found_terms: Optional[frozenset] = None) -> List[str]:
         """Extract relevant tags from text."""
-        tags = []
-        text_lower = text.lower()
+        if found_terms is None:
+            found_terms = self._find_terms(text.lower())
 
         # Extract technical terms
-        technical_terms = [
-            'cisco', 'router', 'switch', 'firewall', 'server',
-            'ethernet', 'fiber', 'copper', 'wireless', 'bluetooth',
-            'usb', 'hdmi', 'vga', 'serial', 'parallel'
-        ]
+        tags = [term for term in self.technical_terms if term in found_terms]
 
-        for term in technical_terms:
-            if term in text_lower:
-                tags.append(term)
-
-        # Extract full measurements (e.g., 100V, 1GB)
-        measurement_patterns = [
-            r'\b\d+(?:\.\d+)?\s*(mm|cm|m|inch|ft)\b',  # Length
-            r'\b\d+(?:\.\d+)?\s*(kg|lb|g)\b',          # Weight
-            r'\b\d+(?:\.\d+)?\s*(V|A|W|Hz)\b',         # Electrical
-            r'\b\d+(?:\.\d+)?\s*(GB|MB|TB)\b',         # Storage
-            r'\b\d+(?:\.\d+)?\s*V\b',                  # e.g., 100V
-            r'\b\d+(?:\.\d+)?\s*GB\b',                 # e.g., 1GB
-        ]
-
-        for pattern in measurement_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                tags.append(match.group(0).strip())
+        # Extract full measurements (e.g., 100V, 1GB) in a single pass
+        tags.extend(match.group(0).strip() for match in _MEASUREMENT_RE.finditer(text))
 
         return list(set(tags))  # Remove duplicates
 
@@ -315,19 +387,21 @@ class StructuredExtractor:
         return items
 
     def _deduplicate_content(self, content_list: List[ExtractedContent]) -> List[ExtractedContent]:
-        """Remove duplicate content items."""
-        seen = set()
-        unique_content = []
+        """Remove duplicate content items, keeping the most confident of each."""
+        best: Dict[bytes, ExtractedContent] = {}
 
         for item in content_list:
-            # Create a hash of the content for deduplication
-            content_hash = hash(item.content.lower().strip())
+            # Fixed-size digest of the normalized content as the dedup key
+            content_key = hashlib.blake2b(
+                item.content.lower().strip().encode('utf-8'), digest_size=16
+            ).digest()
 
-            if content_hash not in seen:
-                seen.add(content_hash)
-                unique_content.append(item)
+            current = best.get(content_key)
+            if current is None or item.confidence > current.confidence:
+                best[content_key] = item
 
-        return unique_content
+        # Dict order follows first occurrence of each key
+        return list(best.values())
 
     def get_content_summary(self, extracted_content: List[ExtractedContent]) -> Dict[str, Any]:
         """Generate a summary of extracted content."""
@@ -193,44 +193,56 @@ class SectionClassifier:
             'classification_report': report
         }
     
-    def classify_section(self, heading: str, content: List[str] = None) -> Dict[str, Any]:
-        """Classify a section based on its heading and content."""
-        if not self.is_trained:
-            logger.warning("Classifier not trained. Training with default data...")
-            self.train()
-        
-        # Combine heading and content for classification
+    @staticmethod
+    def _section_text(heading: str, content: List[str] = None) -> str:
+        """Combine heading and content into the text used for classification."""
         text = heading
         if content:
             text += " " + " ".join(content[:3])  # Use first 3 content items
+        return text
+    
+    def _classify_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Classify a batch of texts with a single vectorize/predict call."""
+        if not self.is_trained:
+            logger.warning("Classifier not trained. Training with default data...")
+            self.train()
         
-        # Vectorize
-        text_vector = self.vectorizer.transform([text])
+        if not texts:
+            return []
         
-        # Predict
-        prediction = self.classifier.predict(text_vector)[0]
-        probabilities = self.classifier.predict_proba(text_vector)[0]
+        # Vectorize and predict the whole batch at once
+        text_vectors = self.vectorizer.transform(texts)
+        probabilities = self.classifier.predict_proba(text_vectors)
+        predictions = self.classifier.classes_[np.argmax(probabilities, axis=1)]
         
-        # Get confidence scores
-        confidence_scores = dict(zip(self.classifier.classes_, probabilities))
+        results = []
+        for text, prediction, row in zip(texts, predictions, probabilities):
+            # Get confidence scores
+            confidence_scores = dict(zip(self.classifier.classes_, row))
+            results.append({
+                'predicted_class': prediction,
+                'confidence': confidence_scores[prediction],
+                'all_probabilities': confidence_scores,
+                'text_analyzed': text[:100] + "..." if len(text) > 100 else text
+            })
         
-        return {
-            'predicted_class': prediction,
-            'confidence': confidence_scores[prediction],
-            'all_probabilities': confidence_scores,
-            'text_analyzed': text[:100] + "..." if len(text) > 100 else text
-        }
+        return results
+    
+    def classify_section(self, heading: str, content: List[str] = None) -> Dict[str, Any]:
+        """Classify a section based on its heading and content."""
+        return self._classify_texts([self._section_text(heading, content)])[0]
     
     def classify_sections(self, sections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Classify multiple sections."""
+        """Classify multiple sections in one batched prediction."""
         classified_sections = []
         
-        for section in sections:
-            heading = section.get('heading', '')
-            content = section.get('content', [])
-            
-            classification = self.classify_section(heading, content)
-            
+        texts = [
+            self._section_text(section.get('heading', ''), section.get('content', []))
+            for section in sections
+        ]
+        classifications = self._classify_texts(texts)
+        
+        for section, classification in zip(sections, classifications):
             classified_section = {
                 **section,
                 'ml_classification': classification,
@@ -7,18 +7,38 @@ generation system with confidence visualization and interactive gap reports.
 """
 
 import asyncio
+import hashlib
+import io
 import json
 import os
+import shutil
 import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List
 
+import numpy as np
 from flask import Flask, jsonify, redirect, render_template, request, send_file, url_for
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 # Import our AI pipeline components
 from ai_doc_gen.core.pipeline_orchestrator import PipelineOrchestrator
 
@@ -51,12 +71,52 @@ def serialize_pipeline_results(results):
     else:
         return results
 
+def orjson_default(obj):
+    """orjson ``default`` hook covering what serialize_pipeline_results converts.
+
+    Enums and dataclasses are handled natively by orjson; models are dumped here
+    and anything else goes to Flask's default (dates, UUIDs, decimals).
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, 'model_dump'):  # Pydantic v2 model
+        return obj.model_dump()
+    if hasattr(obj, 'dict'):  # Pydantic model
+        return obj.dict()
+    return DefaultJSONProvider.default(obj)
+
+def jsonify_results(results):
+    """jsonify pipeline results, letting orjson convert enums and models in C when available."""
+    if orjson is not None:
+        return jsonify(results)
+    return jsonify(serialize_pipeline_results(results))
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson for faster API responses."""
+    def dumps(self, obj, **kwargs):
+        # Match DefaultJSONProvider output: sorted keys, and datetimes passed to
+        # the default hook so they keep Flask's HTTP-date format
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=orjson_default, option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.json_encoder = CustomJSONEncoder
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['OUTPUT_FOLDER'] = 'outputs'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
+app.config['BATCH_MAX_WORKERS'] = int(os.getenv('BATCH_MAX_WORKERS', 4))
 
 # Ensure directories exist
 Path(app.config['UPLOAD_FOLDER']).mkdir(exist_ok=True)
@@ -66,13 +126,27 @@ Path(app.config['OUTPUT_FOLDER']).mkdir(exist_ok=True)
 pipeline_results = {}
 batch_jobs = {}
 
-class BatchJobStatus(Enum):
-    PENDING = "pending"
-    PROCESSING = "processing"
-    COMPLETED = "completed"
-    FAILED = "failed"
+# Rendered PDF exports keyed by results digest, least recently used first
+PDF_CACHE_SIZE = 128
+_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+class BatchJobStatus(IntEnum):
+    PENDING = 0
+    PROCESSING = 1
+    COMPLETED = 2
+    FAILED = 3
+
+# Wire names for BatchJobStatus, indexed by value
+_BATCH_STATUS_NAMES = ('pending', 'processing', 'completed', 'failed')
 
 class BatchJob:
+    __slots__ = (
+        'batch_id', 'files', 'status', 'progress', 'total_files', 'completed_files',
+        'failed_files', 'results', 'errors', 'start_time', 'end_time', 'created_at',
+        'start_ns', 'end_ns'
+    )
+
     def __init__(self, batch_id: str, files: List[str]):
         self.batch_id = batch_id
         self.files = files
@@ -86,11 +160,21 @@ class BatchJob:
         self.start_time = None
         self.end_time = None
         self.created_at = datetime.now()
+        # Monotonic timestamps for measuring elapsed processing time
+        self.start_ns = None
+        self.end_ns = None
+
+    @property
+    def duration_seconds(self):
+        """Elapsed processing time, or None if the batch has not finished."""
+        if self.start_ns is None or self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e9
 
     def to_dict(self):
         return {
             'batch_id': self.batch_id,
-            'status': self.status.value,
+            'status': _BATCH_STATUS_NAMES[self.status],
             'progress': self.progress,
             'total_files': self.total_files,
             'completed_files': self.completed_files,
@@ -99,29 +183,43 @@ class BatchJob:
             'errors': self.errors,
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
+            'duration_seconds': self.duration_seconds,
             'created_at': self.created_at.isoformat()
         }
 
+def _process_batch_file(filepath: str) -> dict:
+    """Process one batch file, failing fast when it is missing."""
+    if not os.path.exists(filepath):
+        raise FileNotFoundError('File not found')
+    return process_document(filepath)
+
 def process_batch_async(batch_id: str):
     """Process batch of documents asynchronously."""
     batch_job = batch_jobs[batch_id]
     batch_job.status = BatchJobStatus.PROCESSING
     batch_job.start_time = datetime.now()
+    batch_job.start_ns = time.perf_counter_ns()
+    
+    max_workers = max(1, min(app.config['BATCH_MAX_WORKERS'], batch_job.total_files))
     
     try:
-        for i, filepath in enumerate(batch_job.files):
-            try:
-                # Process individual document
-                result = process_document(filepath)
-                batch_job.results[Path(filepath).name] = result
-                batch_job.completed_files += 1
-            except Exception as e:
-                batch_job.errors[Path(filepath).name] = str(e)
-                batch_job.failed_files += 1
-            
-            # Update progress
-            batch_job.progress = int(((i + 1) / batch_job.total_files) * 100)
-            time.sleep(0.1)  # Small delay to allow status updates
+        # Documents are independent, so fan them out across worker threads
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            done = 0
+            futures = {pool.submit(_process_batch_file, filepath): filepath for filepath in batch_job.files}
+            for future in as_completed(futures):
+                # Only this thread collects results, so no lock is needed
+                name = os.path.basename(futures[future])
+                try:
+                    batch_job.results[name] = future.result()
+                    batch_job.completed_files += 1
+                except Exception as e:
+                    batch_job.errors[name] = str(e)
+                    batch_job.failed_files += 1
+                
+                # Update progress
+                done += 1
+                batch_job.progress = int((done / batch_job.total_files) * 100)
         
         batch_job.status = BatchJobStatus.COMPLETED
     except Exception as e:
@@ -129,6 +227,7 @@ def process_batch_async(batch_id: str):
         batch_job.errors['batch_error'] = str(e)
     finally:
         batch_job.end_time = datetime.now()
+        batch_job.end_ns = time.perf_counter_ns()
 
 @app.route('/')
 def index():
@@ -187,7 +286,7 @@ def batch_upload():
 
         if saved_files:
             # Create batch job
-            batch_id = f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}"
+            batch_id = f"batch_{uuid.uuid4().hex}"
             batch_job = BatchJob(batch_id, saved_files)
             batch_jobs[batch_id] = batch_job
 
@@ -237,7 +336,7 @@ def process_document_route(filename):
 def get_results(job_id):
     """Get processing results for a specific job."""
     if job_id in pipeline_results:
-        return jsonify(serialize_pipeline_results(pipeline_results[job_id]))
+        return jsonify_results(pipeline_results[job_id])
     return jsonify({'error': 'Job not found'}), 404
 
 @app.route('/visualize/<job_id>')
@@ -257,7 +356,7 @@ def export_results(job_id, format):
     results = pipeline_results[job_id]
 
     if format == 'json':
-        return jsonify(serialize_pipeline_results(results))
+        return jsonify_results(results)
     elif format == 'markdown':
         # Return the generated markdown file if it exists
         output_dir = results.get('output_dir', '')
@@ -267,35 +366,86 @@ def export_results(job_id, format):
                 return send_file(str(md_file), as_attachment=True, download_name=f'draft_{job_id}.md')
         return jsonify({'error': 'Markdown file not found'}), 404
     elif format == 'pdf':
-        # Generate PDF from results
+        # Generate PDF from results, reusing the bytes for unchanged results
         try:
-            pdf_file = generate_pdf_from_results(results)
-            return send_file(pdf_file, as_attachment=True, download_name=f'draft_{job_id}.pdf')
+            results_hash = hashlib.blake2b(_results_cache_payload(results), digest_size=16).hexdigest()
+            pdf_data = _pdf_bytes(results_hash, results)
+            return send_file(
+                io.BytesIO(pdf_data),
+                mimetype='application/pdf',
+                as_attachment=True,
+                download_name=f'draft_{job_id}.pdf'
+            )
         except Exception as e:
             return jsonify({'error': f'PDF generation failed: {str(e)}'}), 500
     else:
         return jsonify({'error': 'Unsupported format'}), 400
 
-def generate_pdf_from_results(results):
-    """Generate PDF from pipeline results."""
+def _results_cache_payload(results) -> bytes:
+    """Serialize results deterministically for use as a PDF cache key."""
+    if orjson is not None:
+        return orjson.dumps(results, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(results, default=str, sort_keys=True).encode('utf-8')
+
+def _pdf_bytes(results_hash: str, results) -> bytes:
+    """Render the PDF for a result set, cached by the hash of its serialized form."""
+    with _pdf_cache_lock:
+        pdf_data = _pdf_cache.get(results_hash)
+        if pdf_data is not None:
+            _pdf_cache.move_to_end(results_hash)
+            return pdf_data
+    
+    pdf_data = generate_pdf_from_results(results, as_bytes=True)
+    with _pdf_cache_lock:
+        _pdf_cache[results_hash] = pdf_data
+        if len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return pdf_data
+
+def _format_confidence_rows(scores):
+    """Format confidence scores as (section, 'NN.N%') rows in one vectorized pass."""
+    if not scores:
+        return []
+    try:
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+    except (TypeError, ValueError):
+        # Non-numeric scores: keep their original text
+        return [(str(section), f"{score}%") for section, score in scores.items()]
+    formatted = np.char.add(np.char.mod('%.1f', values), '%')
+    return list(zip(map(str, scores), formatted.tolist()))
+
+@lru_cache(maxsize=1)
+def _get_pdf_styles():
+    """Build the ReportLab stylesheet once and reuse it for every export."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    
+    styles = getSampleStyleSheet()
+    return {
+        'title': styles['Title'],
+        'heading': styles['Heading2'],
+        'normal': styles['Normal']
+    }
+
+def generate_pdf_from_results(results, as_bytes=False):
+    """
+    Generate PDF from pipeline results.
+    
+    Returns the path of a temporary PDF file, or the PDF bytes when
+    as_bytes is True.
+    """
     try:
         from reportlab.lib.pagesizes import letter
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
         import tempfile
         
-        # Create temporary PDF file
-        pdf_file = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf')
-        pdf_path = pdf_file.name
-        pdf_file.close()
-        
-        # Create PDF document
-        doc = SimpleDocTemplate(pdf_path, pagesize=letter)
-        styles = getSampleStyleSheet()
+        # Render into memory; only touch the filesystem when a path is wanted
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        styles = _get_pdf_styles()
         story = []
         
         # Add title
-        title = Paragraph("AI-Generated Hardware Documentation", styles['Title'])
+        title = Paragraph("AI-Generated Hardware Documentation", styles['title'])
         story.append(title)
         story.append(Spacer(1, 12))
         
@@ -305,21 +455,28 @@ def generate_pdf_from_results(results):
             
             # Add confidence scores
             if 'confidence_scores' in pipeline_data:
-                story.append(Paragraph("Confidence Scores", styles['Heading2']))
-                for section, score in pipeline_data['confidence_scores'].items():
-                    story.append(Paragraph(f"{section}: {score}%", styles['Normal']))
+                story.append(Paragraph("Confidence Scores", styles['heading']))
+                rows = _format_confidence_rows(pipeline_data['confidence_scores'])
+                if rows:
+                    story.append(Table(rows, hAlign='LEFT'))
                 story.append(Spacer(1, 12))
             
             # Add gap analysis
             if 'gap_analysis' in pipeline_data:
-                story.append(Paragraph("Gap Analysis", styles['Heading2']))
+                story.append(Paragraph("Gap Analysis", styles['heading']))
                 for gap in pipeline_data['gap_analysis']:
-                    story.append(Paragraph(f"• {gap}", styles['Normal']))
+                    story.append(Paragraph(f"• {gap}", styles['normal']))
                 story.append(Spacer(1, 12))
         
         # Build PDF
         doc.build(story)
-        return pdf_path
+        if as_bytes:
+            return buffer.getvalue()
+        
+        buffer.seek(0)
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as pdf_file:
+            shutil.copyfileobj(buffer, pdf_file)
+        return pdf_file.name
         
     except ImportError:
         raise Exception("PDF generation requires reportlab library. Install with: pip install reportlab")
@@ -330,9 +487,9 @@ def generate_pdf_from_results(results):
 def get_status(job_id):
     """Get real-time status of a processing job."""
     if job_id in pipeline_results:
-        return jsonify({
+        return jsonify_results({
             'status': 'completed',
-            'results': serialize_pipeline_results(pipeline_results[job_id])
+            'results': pipeline_results[job_id]
         })
     return jsonify({'status': 'not_found'}), 404
 
@@ -484,8 +641,8 @@ def system_health():
 def get_system_metrics():
     """Get real-time system performance metrics."""
     try:
-        import psutil
-        import os
+        if psutil is None:
+            raise ImportError("psutil")
         
         # CPU metrics
         cpu_percent = psutil.cpu_percent(interval=1)
@@ -583,7 +740,8 @@ def get_system_metrics():
 def get_system_health():
     """Get system health status."""
     try:
-        import psutil
+        if psutil is None:
+            raise ImportError("psutil")
         
         # Basic health checks
         cpu_percent = psutil.cpu_percent(interval=1)
@@ -622,12 +780,13 @@ def get_system_health():
 
 def process_document(filepath: str) -> dict:
     """Process a document through the AI pipeline."""
-    # Generate unique job ID
-    job_id = datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]
+    # Generate unique job ID; batch workers can start in the same millisecond
+    job_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}_{uuid.uuid4().hex}"
+    filename = os.path.basename(filepath)
 
     # Create output directory
     output_dir = Path(app.config['OUTPUT_FOLDER']) / f"job_{job_id}"
-    output_dir.mkdir(exist_ok=True)
+    output_dir.mkdir(exist_ok=False)
 
     try:
         # Initialize pipeline
@@ -653,7 +812,7 @@ def process_document(filepath: str) -> dict:
         # Store results
         result = {
             'job_id': job_id,
-            'filename': Path(filepath).name,
+            'filename': filename,
             'output_dir': str(output_dir),
             'status': 'completed',
             'timestamp': datetime.now().isoformat(),
@@ -667,7 +826,7 @@ def process_document(filepath: str) -> dict:
         # Store error results
         error_result = {
             'job_id': job_id,
-            'filename': Path(filepath).name,
+            'filename': filename,
             'output_dir': str(output_dir),
             'status': 'error',
             'error': str(e),
@@ -245,7 +245,7 @@ def create_enhanced_synonym_prompt(title: str, acronym_expander: AcronymExpander
         prompt = prompt.rstrip(', ') + '. '
         prompt += 'Include both the acronym and full term variations in your response.'
     
-    prompt += '\n\nReturn as a Python list of strings only.'
+    prompt += '\n\nReturn as a JSON array of strings only.'
     
     return prompt
 
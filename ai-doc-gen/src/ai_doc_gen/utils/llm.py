@@ -7,12 +7,19 @@ import os
 import json
 import logging
 import hashlib
+import mmap
+import re
 import time
 import tempfile
-import shutil
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -43,15 +50,96 @@ except ImportError:
     ACRONYM_EXPANDER_AVAILABLE = False
 
 
+# Entries kept in each LLMUtility's in-process response cache
+MEMORY_CACHE_SIZE = 4096
+
+# Section pairs sent to the LLM in one completion by match_sections_batch
+MATCH_BATCH_SIZE = 32
+
+# Few-shot examples shared by the single and batched section-matching prompts
+_MATCH_EXAMPLES = """You are matching documentation sections for Cisco hardware installation guides. 
+
+Examples:
+Template: "Power over Ethernet"
+Candidate: "PoE"
+Match: Yes
+Confidence: 0.95
+Reasoning: "PoE" is the standard abbreviation for "Power over Ethernet" in networking documentation.
+
+Template: "Rack Installation"
+Candidate: "Mounting the device in a rack"
+Match: Yes
+Confidence: 0.85
+Reasoning: The candidate describes the same process as the template, just with different wording.
+
+Template: "Grounding Requirements"
+Candidate: "Electrical Safety"
+Match: Partial
+Confidence: 0.60
+Reasoning: "Electrical Safety" includes grounding but is broader in scope.
+
+Template: "Power over Ethernet"
+Candidate: "Network Configuration"
+Match: No
+Confidence: 0.10
+Reasoning: These are completely different topics with no semantic overlap.
+"""
+
+# First bracketed list in an LLM reply that wraps its JSON array in prose
+_JSON_LIST_RE = re.compile(r'\[[^\]]*\]')
+
+# Fallback parsers for LLM replies that are not well-formed JSON
+_QUOTED_RE = re.compile(r'"([^"]*)"')
+_BRACKETED_RE = re.compile(r'\[(.*?)\]')
+_MATCH_FIELD_RE = re.compile(r'"match":\s*"(Yes|No|Partial)"', re.IGNORECASE)
+_CONFIDENCE_FIELD_RE = re.compile(r'"confidence":\s*([0-9]*\.?[0-9]+)')
+_REASONING_FIELD_RE = re.compile(r'"reasoning":\s*"([^"]*)"')
+
+# Markup, script and injection patterns that disqualify an LLM synonym
+_SUSPICIOUS_SYNONYM_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'<script[^>]*>',  # Script tags
+    r'javascript:',     # JavaScript protocol
+    r'data:',          # Data protocol
+    r'vbscript:',      # VBScript protocol
+    r'<iframe[^>]*>',  # Iframe tags
+    r'<object[^>]*>',  # Object tags
+    r'<embed[^>]*>',   # Embed tags
+    r'<form[^>]*>',    # Form tags
+    r'exec\s*\(',      # exec() function calls
+    r'eval\s*\(',      # eval() function calls
+    r'system\s*\(',    # system() function calls
+    r'shell_exec\s*\(', # shell_exec() function calls
+    r'rm\s+-rf',       # Dangerous rm commands
+    r'delete\s+from',  # SQL injection patterns
+    r'drop\s+table',   # SQL injection patterns
+    r'union\s+select', # SQL injection patterns
+    r'<.*?>',          # Any HTML tags
+    r'&[#\w]+;',       # HTML entities
+    r'%[0-9a-fA-F]{2}', # URL encoding
+    r'\\x[0-9a-fA-F]{2}', # Hex encoding
+    r'\\u[0-9a-fA-F]{4}', # Unicode encoding
+))
+
+# Path traversal and shell/glob metacharacters rejected in titles
+_DANGEROUS_TITLE_RE = re.compile(r'\.\.|[/\\~*?"<>|]')
+
+
 class CachePoisoningError(Exception):
     """Raised when cache poisoning is detected."""
     pass
 
 
+def _json_loads(data):
+    """Parse JSON with orjson when available; both raise json.JSONDecodeError on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class LLMUtility:
     """Utility class for LLM operations with caching and error handling."""
     
-    def __init__(self, cache_dir: str = "cache", cache_ttl_hours: int = 24, cache_version: str = "1.0"):
+    def __init__(self, cache_dir: str = "cache", cache_ttl_hours: int = 24, cache_version: str = "1.1"):
         self.cache_dir = cache_dir
         self.cache_ttl_hours = cache_ttl_hours
         self.cache_version = cache_version
@@ -59,6 +147,8 @@ class LLMUtility:
         # Cache hit/miss counters
         self.cache_hits = 0
         self.cache_misses = 0
+        # In-process LRU in front of the disk cache: key -> (stored_at, value)
+        self._memory_cache: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
         
         # Initialize acronym expander if available
         self.acronym_expander = None
@@ -80,10 +170,9 @@ class LLMUtility:
             raise ValueError("Title too long (max 200 characters)")
         
         # Remove path traversal attempts
-        dangerous_chars = ['/', '\\', '..', '~', '*', '?', '"', '<', '>', '|']
-        for char in dangerous_chars:
-            if char in title:
-                raise ValueError(f"Dangerous character '{char}' in title")
+        match = _DANGEROUS_TITLE_RE.search(title)
+        if match:
+            raise ValueError(f"Dangerous character '{match.group()}' in title")
         
         return title
     
@@ -104,35 +193,10 @@ class LLMUtility:
                 logger.warning(f"Skipping overly long synonym: {synonym[:50]}...")
                 continue
             
-            # Check for suspicious patterns - more comprehensive patterns
-            suspicious_patterns = [
-                r'<script[^>]*>',  # Script tags
-                r'javascript:',     # JavaScript protocol
-                r'data:',          # Data protocol
-                r'vbscript:',      # VBScript protocol
-                r'<iframe[^>]*>',  # Iframe tags
-                r'<object[^>]*>',  # Object tags
-                r'<embed[^>]*>',   # Embed tags
-                r'<form[^>]*>',    # Form tags
-                r'exec\s*\(',      # exec() function calls
-                r'eval\s*\(',      # eval() function calls
-                r'system\s*\(',    # system() function calls
-                r'shell_exec\s*\(', # shell_exec() function calls
-                r'rm\s+-rf',       # Dangerous rm commands
-                r'delete\s+from',  # SQL injection patterns
-                r'drop\s+table',   # SQL injection patterns
-                r'union\s+select', # SQL injection patterns
-                r'<.*?>',          # Any HTML tags
-                r'&[#\w]+;',       # HTML entities
-                r'%[0-9a-fA-F]{2}', # URL encoding
-                r'\\x[0-9a-fA-F]{2}', # Hex encoding
-                r'\\u[0-9a-fA-F]{4}', # Unicode encoding
-            ]
-            
-            import re
+            # Check for suspicious patterns
             is_suspicious = False
-            for pattern in suspicious_patterns:
-                if re.search(pattern, synonym, re.IGNORECASE):
+            for pattern in _SUSPICIOUS_SYNONYM_PATTERNS:
+                if pattern.search(synonym):
                     logger.warning(f"Skipping suspicious synonym: {synonym}")
                     is_suspicious = True
                     break
@@ -162,18 +226,47 @@ class LLMUtility:
         
         return validated_synonyms
     
+    @staticmethod
+    def _normalize_title(title: str) -> str:
+        """Normalize a title so casing and spacing variants share cache entries."""
+        return ' '.join(title.split()).casefold()
+    
     def _generate_cache_key(self, title: str) -> str:
-        """Generate a safe cache key with hash for integrity."""
-        # Create a hash of the title for the filename
-        title_hash = hashlib.sha256(title.encode('utf-8')).hexdigest()[:16]
-        safe_title = "".join(c for c in title.lower() if c.isalnum() or c in '_-')[:50]
-        return f"synonyms_{safe_title}_{title_hash}.json"
+        """Generate a safe cache file name from a digest of the normalized title."""
+        title_hash = hashlib.blake2b(self._normalize_title(title).encode('utf-8'), digest_size=8).hexdigest()
+        return f"synonyms_{title_hash}.json"
+    
+    def _memory_cache_get(self, key: Tuple) -> Optional[Any]:
+        """Return a live in-process cache entry, or None."""
+        entry = self._memory_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if (time.time() - stored_at) > (self.cache_ttl_hours * 3600):
+            del self._memory_cache[key]
+            return None
+        self._memory_cache.move_to_end(key)
+        return value
+    
+    def _memory_cache_put(self, key: Tuple, value: Any):
+        """Store a successful result in the in-process cache, evicting the oldest."""
+        self._memory_cache[key] = (time.time(), value)
+        self._memory_cache.move_to_end(key)
+        if len(self._memory_cache) > MEMORY_CACHE_SIZE:
+            self._memory_cache.popitem(last=False)
     
     def _calculate_cache_hash(self, data: Dict[str, Any]) -> str:
         """Calculate hash of cache data for integrity checking."""
-        # Create a deterministic string representation
-        data_str = json.dumps(data, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
+        # Create a deterministic byte representation. Both encoders emit the same
+        # compact, key-sorted UTF-8 for the fields we store (strings, temperature,
+        # timestamp); floats printed in exponent form (1e-05 vs 1e-5) would differ
+        if orjson is not None:
+            data_bytes = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+        else:
+            data_bytes = json.dumps(
+                data, sort_keys=True, separators=(',', ':'), ensure_ascii=False
+            ).encode('utf-8')
+        return hashlib.sha256(data_bytes).hexdigest()
     
     def _is_cache_expired(self, cache_data: Dict[str, Any]) -> bool:
         """Check if cache has expired."""
@@ -184,13 +277,21 @@ class LLMUtility:
     def _load_cache_safely(self, cache_path: str) -> Optional[Dict[str, Any]]:
         """Safely load cache with integrity checks."""
         try:
-            # Check file size (prevent DoS with huge files)
-            if os.path.getsize(cache_path) > 1024 * 1024:  # 1MB limit
-                logger.warning(f"Cache file too large: {cache_path}")
-                return None
-            
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            with open(cache_path, 'rb') as f:
+                # Check file size (prevent DoS with huge files)
+                size = os.fstat(f.fileno()).st_size
+                if size > 1024 * 1024:  # 1MB limit
+                    logger.warning(f"Cache file too large: {cache_path}")
+                    return None
+                if size == 0:
+                    raise json.JSONDecodeError("Empty cache file", "", 0)
+                
+                if orjson is not None:
+                    # Parse straight from the mapped pages, no intermediate str
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                        cache_data = orjson.loads(view)
+                else:
+                    cache_data = json.loads(f.read())
             
             # Validate cache structure
             required_fields = ['title', 'synonyms', 'model', 'temperature', 'prompt', 'timestamp', 'version', 'hash']
@@ -232,31 +333,84 @@ class LLMUtility:
             logger.warning(f"Failed to load cache: {cache_path}, error: {e}")
             return None
     
+    def _link_anonymous_cache_file(self, cache_path: str, payload: bytes) -> bool:
+        """Write payload into an unnamed O_TMPFILE inode and link it in once complete.
+        
+        Returns False when the platform or filesystem cannot do this, so the
+        caller can fall back to a named temp file.
+        """
+        if not hasattr(os, 'O_TMPFILE'):
+            return False
+        try:
+            fd = os.open(os.path.dirname(cache_path) or '.', os.O_WRONLY | os.O_TMPFILE, 0o600)
+        except OSError:
+            return False  # Filesystem without O_TMPFILE support
+        
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            fd_path = f'/proc/self/fd/{fd}'
+            try:
+                os.link(fd_path, cache_path)
+            except FileExistsError:
+                # Replacing an existing entry: link under a unique name, then rename over it
+                staged_path = f'{cache_path}.{os.getpid()}.{time.monotonic_ns()}.tmp'
+                os.link(fd_path, staged_path)
+                try:
+                    os.replace(staged_path, cache_path)
+                except OSError:
+                    os.remove(staged_path)
+                    raise
+            return True
+        except OSError as e:
+            # e.g. /proc not mounted or linkat across mounts (EXDEV) in sandboxes
+            logger.debug(f"O_TMPFILE cache write unavailable, using temp file: {e}")
+            return False
+        finally:
+            os.close(fd)
+    
+    def _write_cache_file(self, cache_path: str, payload: bytes):
+        """Atomically place payload at cache_path without leaving partial files behind."""
+        if self._link_anonymous_cache_file(cache_path, payload):
+            return
+        
+        # Portable fallback: named temp file in the same directory, then atomic rename
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path) or '.',
+                                         prefix=os.path.basename(cache_path) + '.',
+                                         suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            try:
+                f.write(payload)
+            except BaseException:
+                f.close()
+                os.remove(temp_path)
+                raise
+        try:
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    
     def _save_cache_safely(self, cache_path: str, cache_data: Dict[str, Any]) -> bool:
         """Safely save cache with atomic writes and integrity protection."""
         try:
             # Add metadata
             cache_data['timestamp'] = time.time()
             cache_data['version'] = self.cache_version
-            cache_data['hash'] = self._calculate_cache_hash(cache_data)
+            cache_data['hash'] = self._calculate_cache_hash({k: v for k, v in cache_data.items() if k != 'hash'})
             
-            # Write to temporary file first (atomic operation)
-            temp_path = cache_path + '.tmp'
-            with open(temp_path, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                payload = orjson.dumps(cache_data, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(cache_data, indent=2, ensure_ascii=False).encode('utf-8')
             
-            # Atomic move
-            shutil.move(temp_path, cache_path)
+            # Atomic write: readers see either the old file or the complete new one
+            self._write_cache_file(cache_path, payload)
             return True
             
         except Exception as e:
             logger.error(f"Failed to save cache: {cache_path}, error: {e}")
-            # Clean up temp file if it exists
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
             return False
     
     def _clear_poisoned_cache(self, cache_path: str):
@@ -297,8 +451,14 @@ class LLMUtility:
         except ValueError as e:
             logger.error(f"Invalid input: {e}")
             return []
-            
-        # Check cache first
+        
+        # Check the in-process cache, then the disk cache
+        memory_key = ('synonyms', model, temperature, self._normalize_title(title))
+        cached_synonyms = self._memory_cache_get(memory_key)
+        if cached_synonyms is not None:
+            self.cache_hits += 1
+            return list(cached_synonyms)
+        
         cache_key = self._generate_cache_key(title)
         cache_path = os.path.join(self.cache_dir, cache_key)
         
@@ -307,7 +467,9 @@ class LLMUtility:
             if cache_data:
                 self.cache_hits += 1
                 logger.info(f"Using cached synonyms for '{title}'")
-                return cache_data.get('synonyms', [])
+                synonyms = cache_data.get('synonyms', [])
+                self._memory_cache_put(memory_key, tuple(synonyms))
+                return synonyms
             else:
                 # Cache was poisoned or corrupted, remove it
                 self._clear_poisoned_cache(cache_path)
@@ -323,7 +485,7 @@ class LLMUtility:
             prompt = (
                 f'For the documentation section title "{title}", list all common synonyms and abbreviations '
                 'used in Cisco hardware documentation. Focus on technical terms, acronyms, and variations '
-                'that would appear in official documentation. Return as a Python list of strings only.'
+                'that would appear in official documentation. Return as a JSON array of strings only.'
             )
         
         try:
@@ -338,16 +500,9 @@ class LLMUtility:
             logger.info(f"LLM response for '{title}': {content}")
             
             # Extract and validate the list from the response
-            try:
-                # Try to evaluate as Python list
-                synonyms = eval(content)
-                if isinstance(synonyms, list):
-                    synonyms = [s.strip() for s in synonyms if isinstance(s, str) and s.strip()]
-                else:
-                    # Fallback: try to parse as JSON
-                    synonyms = json.loads(content)
-            except Exception as e:
-                logger.warning(f"Failed to parse LLM response as list: {e}")
+            synonyms = self._parse_synonym_list(content)
+            if synonyms is None:
+                logger.warning(f"Failed to parse LLM response as a JSON array for '{title}'")
                 # Fallback: extract words that look like synonyms
                 synonyms = self._extract_synonyms_from_text(content)
             
@@ -374,6 +529,7 @@ class LLMUtility:
                 logger.info(f"Generated and cached {len(validated_synonyms)} synonyms for '{title}': {validated_synonyms}")
             else:
                 logger.warning(f"Failed to cache synonyms for '{title}'")
+            self._memory_cache_put(memory_key, tuple(validated_synonyms))
             
             return validated_synonyms
             
@@ -381,15 +537,32 @@ class LLMUtility:
             logger.error(f"Failed to get synonyms for '{title}': {e}")
             return []
     
+    def _parse_synonym_list(self, content: str) -> Optional[List[str]]:
+        """Parse a JSON array of strings from an LLM reply, or return None."""
+        try:
+            parsed = _json_loads(content)
+        except (ValueError, TypeError):
+            # The array may be wrapped in prose; try the first bracketed block
+            match = _JSON_LIST_RE.search(content) if isinstance(content, str) else None
+            if not match:
+                return None
+            try:
+                parsed = _json_loads(match.group())
+            except ValueError:
+                return None
+        
+        if not isinstance(parsed, list):
+            return None
+        return [s.strip() for s in parsed if isinstance(s, str) and s.strip()]
+    
     def _extract_synonyms_from_text(self, text: str) -> List[str]:
         """Fallback method to extract synonyms from LLM text response."""
-        import re
         synonyms = []
         # Extract quoted strings
-        quoted = re.findall(r'"([^"]*)"', text)
+        quoted = _QUOTED_RE.findall(text)
         synonyms.extend(quoted)
         # Extract items in brackets
-        bracketed = re.findall(r'\[(.*?)\]', text)
+        bracketed = _BRACKETED_RE.findall(text)
         for item in bracketed:
             items = [i.strip().strip('"\'') for i in item.split(',')]
             synonyms.extend(items)
@@ -422,34 +595,14 @@ class LLMUtility:
         if not client:
             return {'match': False, 'confidence': 0.0, 'reasoning': 'OpenAI not available'}
         
+        memory_key = ('match', model, temperature, template_section, candidate_section)
+        cached_result = self._memory_cache_get(memory_key)
+        if cached_result is not None:
+            self.cache_hits += 1
+            return dict(cached_result)
+        
         prompt = f"""
-You are matching documentation sections for Cisco hardware installation guides. 
-
-Examples:
-Template: "Power over Ethernet"
-Candidate: "PoE"
-Match: Yes
-Confidence: 0.95
-Reasoning: "PoE" is the standard abbreviation for "Power over Ethernet" in networking documentation.
-
-Template: "Rack Installation"
-Candidate: "Mounting the device in a rack"
-Match: Yes
-Confidence: 0.85
-Reasoning: The candidate describes the same process as the template, just with different wording.
-
-Template: "Grounding Requirements"
-Candidate: "Electrical Safety"
-Match: Partial
-Confidence: 0.60
-Reasoning: "Electrical Safety" includes grounding but is broader in scope.
-
-Template: "Power over Ethernet"
-Candidate: "Network Configuration"
-Match: No
-Confidence: 0.10
-Reasoning: These are completely different topics with no semantic overlap.
-
+{_MATCH_EXAMPLES}
 Now evaluate:
 Template: "{template_section}"
 Candidate: "{candidate_section}"
@@ -474,30 +627,127 @@ Respond with JSON format:
             
             # Try to parse as JSON
             try:
-                result = json.loads(content)
-                return {
-                    'match': result.get('match', 'No'),
-                    'confidence': float(result.get('confidence', 0.0)),
-                    'reasoning': result.get('reasoning', 'No reasoning provided')
-                }
+                match_result = self._normalize_match_result(_json_loads(content))
             except json.JSONDecodeError:
                 # Fallback parsing
-                return self._parse_match_response(content)
+                match_result = self._parse_match_response(content)
+            
+            self._memory_cache_put(memory_key, match_result)
+            return dict(match_result)
                 
         except Exception as e:
             logger.error(f"Failed to match sections: {e}")
             return {'match': 'No', 'confidence': 0.0, 'reasoning': f'Error: {e}'}
     
+    def match_sections_batch(self, pairs: List[Tuple[str, str]], model: str = "gpt-4",
+                             temperature: float = 0.1,
+                             batch_size: int = MATCH_BATCH_SIZE) -> List[Dict[str, Any]]:
+        """
+        Match many (template, candidate) section pairs with one LLM call per batch.
+        
+        Args:
+            pairs: (template_section, candidate_section) tuples to evaluate
+            model: The LLM model to use
+            temperature: Sampling temperature for generation
+            batch_size: Maximum number of pairs sent in a single completion
+            
+        Returns:
+            One match dictionary per pair, in the order given. Results are
+            shared with match_sections_with_llm's cache.
+        """
+        if not client:
+            return [{'match': False, 'confidence': 0.0, 'reasoning': 'OpenAI not available'}
+                    for _ in pairs]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+        pending = []
+        for index, (template_section, candidate_section) in enumerate(pairs):
+            cached_result = self._memory_cache_get(
+                ('match', model, temperature, template_section, candidate_section))
+            if cached_result is not None:
+                self.cache_hits += 1
+                results[index] = dict(cached_result)
+            else:
+                pending.append(index)
+        
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            chunk_pairs = [pairs[index] for index in chunk]
+            for index, match_result in zip(chunk, self._match_chunk(chunk_pairs, model, temperature)):
+                results[index] = match_result
+        
+        return results
+    
+    def _match_chunk(self, pairs: List[Tuple[str, str]], model: str,
+                     temperature: float) -> List[Dict[str, Any]]:
+        """Match one batch of pairs in a single completion, falling back per pair."""
+        numbered = "\n".join(
+            f'{i}. Template: {json.dumps(template_section)} Candidate: {json.dumps(candidate_section)}'
+            for i, (template_section, candidate_section) in enumerate(pairs, 1)
+        )
+        prompt = f"""
+{_MATCH_EXAMPLES}
+Now evaluate each of these {len(pairs)} pairs:
+{numbered}
+
+Respond with a JSON array containing exactly one object per pair, in the same order:
+[
+    {{"match": "Yes/No/Partial", "confidence": 0.0-1.0, "reasoning": "explanation"}}
+]
+"""
+        
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=150 * len(pairs) + 100
+            )
+            parsed = _json_loads(response.choices[0].message.content)
+        except json.JSONDecodeError:
+            parsed = None
+        except Exception as e:
+            logger.error(f"Failed to match section batch: {e}")
+            return [{'match': 'No', 'confidence': 0.0, 'reasoning': f'Error: {e}'} for _ in pairs]
+        
+        if not (isinstance(parsed, list) and len(parsed) == len(pairs)
+                and all(isinstance(item, dict) for item in parsed)):
+            # The model did not answer pair-for-pair; ask about each pair on its own
+            logger.warning("Batch match reply did not line up with the %d pairs sent, "
+                           "matching individually", len(pairs))
+            return [self.match_sections_with_llm(template_section, candidate_section, model, temperature)
+                    for template_section, candidate_section in pairs]
+        
+        match_results = []
+        for (template_section, candidate_section), item in zip(pairs, parsed):
+            try:
+                match_result = self._normalize_match_result(item)
+            except (TypeError, ValueError):
+                match_results.append(self.match_sections_with_llm(
+                    template_section, candidate_section, model, temperature))
+                continue
+            self._memory_cache_put(
+                ('match', model, temperature, template_section, candidate_section), match_result)
+            match_results.append(dict(match_result))
+        return match_results
+    
+    @staticmethod
+    def _normalize_match_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a parsed LLM match object to the match/confidence/reasoning fields."""
+        return {
+            'match': result.get('match', 'No'),
+            'confidence': float(result.get('confidence', 0.0)),
+            'reasoning': result.get('reasoning', 'No reasoning provided')
+        }
+    
     def _parse_match_response(self, text: str) -> Dict[str, Any]:
         """Fallback method to parse LLM match response."""
-        import re
         # Try to extract from JSON-style or label-prefixed lines
         match_result = 'No'
         confidence = 0.0
         reasoning = 'No reasoning provided'
         # Try JSON-style first
-        match_pattern = r'"match":\s*"(Yes|No|Partial)"'
-        match_match = re.search(match_pattern, text, re.IGNORECASE)
+        match_match = _MATCH_FIELD_RE.search(text)
         if match_match:
             match_result = match_match.group(1)
         else:
@@ -512,8 +762,7 @@ Respond with JSON format:
                 elif val.lower().startswith('no'):
                     match_result = 'No'
         # Confidence
-        conf_pattern = r'"confidence":\s*([0-9]*\.?[0-9]+)'
-        conf_match = re.search(conf_pattern, text)
+        conf_match = _CONFIDENCE_FIELD_RE.search(text)
         if conf_match:
             confidence = float(conf_match.group(1))
         else:
@@ -524,8 +773,7 @@ Respond with JSON format:
                 except Exception:
                     confidence = 0.0
         # Reasoning
-        reason_pattern = r'"reasoning":\s*"([^"]*)"'
-        reason_match = re.search(reason_pattern, text)
+        reason_match = _REASONING_FIELD_RE.search(text)
         if reason_match:
             reasoning = reason_match.group(1)
         else:
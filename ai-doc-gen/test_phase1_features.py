@@ -6,30 +6,83 @@ Test script for Phase 1 features:
 - System health dashboard
 """
 
-import json
 import os
-import tempfile
 import time
-from pathlib import Path
-from unittest.mock import Mock, patch
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 from flask import Flask
 from flask.testing import FlaskClient
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 # Import our app components
 from src.ai_doc_gen.ui.app import app, BatchJob, BatchJobStatus, generate_pdf_from_results
 
+# Constant psutil stand-in shared by the system metrics tests
+_FAKE_VM = SimpleNamespace(percent=45.2, used=8 << 30, total=16 << 30)  # 8 GB of 16 GB
+_FAKE_DISK = SimpleNamespace(percent=60.0, used=100 << 30, total=250 << 30)  # 100 GB of 250 GB
+_FAKE_PROC = SimpleNamespace(
+    memory_info=lambda: SimpleNamespace(rss=100 << 20),  # 100 MB
+    cpu_percent=lambda: 5.2
+)
+_FAKE_PSUTIL = SimpleNamespace(
+    cpu_percent=lambda interval=None: 25.5,
+    cpu_count=lambda: 8,
+    virtual_memory=lambda: _FAKE_VM,
+    disk_usage=lambda path: _FAKE_DISK,
+    Process=lambda pid=None: _FAKE_PROC
+)
+
+# Number of files in the simulated batch
+_BATCH_FILE_COUNT = 3
+
+
+def _write_batch_files(directory, count=_BATCH_FILE_COUNT):
+    """Write ``count`` small text files and return their paths."""
+    test_files = []
+    for i in range(count):
+        test_file = directory / f'test_{i}.txt'
+        test_file.write_bytes(f'Test content {i}'.encode())
+        test_files.append(str(test_file))
+    return test_files
+
+
+def _simulate_file(batch_job, filepath, index, total):
+    """Simulate processing one batch file and record the outcome on the job."""
+    name = os.path.basename(filepath)
+    try:
+        # Simulate successful processing
+        batch_job.results[name] = {
+            'status': 'completed',
+            'filename': name,
+            'index': index
+        }
+        batch_job.completed_files += 1
+    except Exception as e:
+        batch_job.errors[name] = str(e)
+        batch_job.failed_files += 1
+    
+    # Update progress
+    done = batch_job.completed_files + batch_job.failed_files
+    batch_job.progress = int((done / total) * 100)
+
 
 class TestPhase1Features:
     """Test suite for Phase 1 web UI enhancements."""
     
-    @pytest.fixture
-    def client(self):
-        """Create a test client for the Flask app."""
+    @pytest.fixture(scope="module")
+    def client(self, tmp_path_factory):
+        """Create a test client for the Flask app, shared across the module."""
         app.config['TESTING'] = True
-        app.config['UPLOAD_FOLDER'] = tempfile.mkdtemp()
-        app.config['OUTPUT_FOLDER'] = tempfile.mkdtemp()
+        app.config['UPLOAD_FOLDER'] = str(tmp_path_factory.mktemp("uploads"))
+        app.config['OUTPUT_FOLDER'] = str(tmp_path_factory.mktemp("outputs"))
         
         with app.test_client() as client:
             yield client
@@ -150,7 +203,7 @@ class TestPhase1Features:
         response = client.get('/api/batch/list')
         assert response.status_code == 200
         
-        data = json.loads(response.data)
+        data = json_loads(response.data)
         assert isinstance(data, dict)
     
     def test_system_health_endpoint(self, client):
@@ -159,31 +212,14 @@ class TestPhase1Features:
         assert response.status_code == 200
         assert b'System Health Dashboard' in response.data
     
-    @patch('src.ai_doc_gen.ui.app.psutil')
-    def test_system_metrics_endpoint(self, mock_psutil, client):
-        """Test system metrics endpoint with mocked psutil."""
-        # Mock psutil responses
-        mock_psutil.cpu_percent.return_value = 25.5
-        mock_psutil.cpu_count.return_value = 8
-        mock_psutil.virtual_memory.return_value = Mock(
-            percent=45.2,
-            used=8 * 1024**3,  # 8 GB
-            total=16 * 1024**3  # 16 GB
-        )
-        mock_psutil.disk_usage.return_value = Mock(
-            percent=60.0,
-            used=100 * 1024**3,  # 100 GB
-            total=250 * 1024**3  # 250 GB
-        )
-        mock_psutil.Process.return_value = Mock(
-            memory_info=Mock(rss=100 * 1024**2),  # 100 MB
-            cpu_percent=5.2
-        )
+    def test_system_metrics_endpoint(self, monkeypatch, client):
+        """Test system metrics endpoint with a fake psutil."""
+        monkeypatch.setattr('src.ai_doc_gen.ui.app.psutil', _FAKE_PSUTIL)
         
         response = client.get('/api/system/metrics')
         assert response.status_code == 200
         
-        data = json.loads(response.data)
+        data = json_loads(response.data)
         assert 'timestamp' in data
         assert 'health_status' in data
         assert 'cpu' in data
@@ -193,12 +229,12 @@ class TestPhase1Features:
         assert 'jobs' in data
         assert 'pipeline' in data
     
-    def test_system_health_endpoint_without_psutil(self, client):
+    def test_system_health_endpoint_without_psutil(self, monkeypatch, client):
         """Test system health endpoint when psutil is not available."""
-        with patch('src.ai_doc_gen.ui.app.psutil', None):
-            response = client.get('/api/system/metrics')
-            assert response.status_code == 500
-            assert b'psutil library not available' in response.data
+        monkeypatch.setattr('src.ai_doc_gen.ui.app.psutil', None)
+        response = client.get('/api/system/metrics')
+        assert response.status_code == 500
+        assert b'psutil library not available' in response.data
     
     def test_pdf_export_endpoint(self, client, sample_results):
         """Test PDF export endpoint."""
@@ -212,58 +248,59 @@ class TestPhase1Features:
                 assert response.status_code == 200
                 assert response.headers['Content-Type'] == 'application/pdf'
     
-    def test_batch_processing_workflow(self):
+    @pytest.mark.parametrize("i", range(_BATCH_FILE_COUNT))
+    def test_batch_single_file(self, i, tmp_path):
+        """Test processing of a single file within a batch."""
+        test_files = _write_batch_files(tmp_path)
+        batch_job = BatchJob(f"test_batch_{uuid.uuid4().hex}", test_files)
+        batch_job.status = BatchJobStatus.PROCESSING
+        
+        _simulate_file(batch_job, test_files[i], i, len(test_files))
+        
+        name = os.path.basename(test_files[i])
+        assert batch_job.completed_files == 1
+        assert batch_job.failed_files == 0
+        assert batch_job.results[name]['filename'] == name
+        assert batch_job.progress == int((1 / len(test_files)) * 100)
+    
+    def test_batch_processing_workflow(self, tmp_path):
         """Test complete batch processing workflow."""
-        # Create test files
-        test_files = []
-        for i in range(3):
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.txt')
-            temp_file.write(f'Test content {i}'.encode())
-            temp_file.close()
-            test_files.append(temp_file.name)
+        # Create test files in a single temporary directory
+        test_files = _write_batch_files(tmp_path)
         
-        try:
-            # Create batch job
-            batch_id = f"test_batch_{int(time.time())}"
-            batch_job = BatchJob(batch_id, test_files)
-            
-            # Simulate processing
-            batch_job.status = BatchJobStatus.PROCESSING
-            batch_job.start_time = time.time()
-            
-            # Process each file
-            for i, filepath in enumerate(test_files):
-                try:
-                    # Simulate successful processing
-                    batch_job.results[Path(filepath).name] = {
-                        'status': 'completed',
-                        'filename': Path(filepath).name
-                    }
-                    batch_job.completed_files += 1
-                except Exception as e:
-                    batch_job.errors[Path(filepath).name] = str(e)
-                    batch_job.failed_files += 1
-                
-                # Update progress
-                batch_job.progress = int(((i + 1) / len(test_files)) * 100)
-            
-            # Complete processing
-            batch_job.status = BatchJobStatus.COMPLETED
-            batch_job.end_time = time.time()
-            
-            # Verify results
-            assert batch_job.status == BatchJobStatus.COMPLETED
-            assert batch_job.completed_files == 3
-            assert batch_job.failed_files == 0
-            assert batch_job.progress == 100
-            assert len(batch_job.results) == 3
-            assert len(batch_job.errors) == 0
-            
-        finally:
-            # Clean up test files
-            for filepath in test_files:
-                if os.path.exists(filepath):
-                    os.unlink(filepath)
+        # Create batch job
+        batch_id = f"test_batch_{uuid.uuid4().hex}"
+        batch_job = BatchJob(batch_id, test_files)
+        
+        # Simulate processing
+        batch_job.status = BatchJobStatus.PROCESSING
+        batch_job.start_ns = time.perf_counter_ns()
+        
+        # Fan the files out the same way the batch worker does: per-file work
+        # overlaps on the pool, and only this thread records outcomes on the job
+        def process_one(filepath):
+            with open(filepath, 'rb') as f:
+                return f.read()
+        
+        with ThreadPoolExecutor(max_workers=min(32, len(test_files))) as pool:
+            futs = {pool.submit(process_one, fp): (i, fp) for i, fp in enumerate(test_files)}
+            for fut in as_completed(futs):
+                fut.result()
+                index, filepath = futs[fut]
+                _simulate_file(batch_job, filepath, index, len(test_files))
+        
+        # Complete processing
+        batch_job.status = BatchJobStatus.COMPLETED
+        batch_job.end_ns = time.perf_counter_ns()
+        
+        # Verify results
+        assert batch_job.status == BatchJobStatus.COMPLETED
+        assert batch_job.completed_files == 3
+        assert batch_job.failed_files == 0
+        assert batch_job.progress == 100
+        assert len(batch_job.results) == 3
+        assert len(batch_job.errors) == 0
+        assert batch_job.duration_seconds >= 0
     
     def test_error_handling_in_batch_processing(self):
         """Test error handling in batch processing."""
@@ -275,12 +312,12 @@ class TestPhase1Features:
         batch_job.status = BatchJobStatus.PROCESSING
         
         for filepath in non_existent_files:
+            name = os.path.basename(filepath)
             try:
                 # This should fail
-                with open(filepath, 'r') as f:
-                    f.read()
+                os.stat(filepath)
             except FileNotFoundError:
-                batch_job.errors[Path(filepath).name] = 'File not found'
+                batch_job.errors[name] = 'File not found'
                 batch_job.failed_files += 1
         
         batch_job.status = BatchJobStatus.FAILED
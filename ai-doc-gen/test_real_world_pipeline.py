@@ -8,23 +8,37 @@ using real DOCX and PDF files provided by the user.
 
 import asyncio
 import json
+from collections import Counter
 from pathlib import Path
 
-from ai_doc_gen.agents.managing_agent import ManagingAgent
-from ai_doc_gen.agents.review_agent import ReviewAgent
-from ai_doc_gen.core.pipeline_orchestrator import PipelineOrchestrator
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def write_json(path, data):
+    """Write ``data`` as indented JSON, using orjson's C encoder when available."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
 
 
 def load_extracted_content(json_file):
     """Load extracted content from JSON file."""
-    with open(json_file) as f:
-        data = json.load(f)
-
-    # Convert back to ExtractedContent objects
     from ai_doc_gen.input_processing.structured_extractor import (
         ContentType,
         ExtractedContent,
     )
+    with open(json_file) as f:
+        data = json.load(f)
+
+    # Convert back to ExtractedContent objects
     content_items = []
     for item in data:
         content_type = ContentType(item['content_type'])
@@ -40,6 +54,10 @@ def load_extracted_content(json_file):
 
 async def test_document_pipeline(doc_name, doc_path, extracted_json):
     """Test the complete pipeline for a single document."""
+    from ai_doc_gen.agents.managing_agent import ManagingAgent
+    from ai_doc_gen.agents.review_agent import ReviewAgent
+    from ai_doc_gen.core.pipeline_orchestrator import PipelineOrchestrator
+
     print(f"\n{'='*80}")
     print(f"TESTING PIPELINE: {doc_name}")
     print(f"{'='*80}")
@@ -141,30 +159,28 @@ async def test_document_pipeline(doc_name, doc_path, extracted_json):
             "low_confidence": review_results['total_low_confidence']
         },
         "content_analysis": {
-            "content_types": {},
+            "content_types": dict(Counter(item.content_type.value for item in extracted_content)),
             "high_confidence_items": 0,
             "medium_confidence_items": 0,
             "low_confidence_items": 0
         }
     }
 
-    # Analyze content types and confidence levels
-    for item in extracted_content:
-        content_type = item.content_type.value
-        summary["content_analysis"]["content_types"][content_type] = \
-            summary["content_analysis"]["content_types"].get(content_type, 0) + 1
-
-        if item.confidence >= 0.8:
-            summary["content_analysis"]["high_confidence_items"] += 1
-        elif item.confidence >= 0.6:
-            summary["content_analysis"]["medium_confidence_items"] += 1
-        else:
-            summary["content_analysis"]["low_confidence_items"] += 1
+    # Bucket confidence levels in one vectorised pass
+    confidences = np.fromiter(
+        (item.confidence for item in extracted_content),
+        dtype=np.float64,
+        count=len(extracted_content)
+    )
+    high = confidences >= 0.8
+    low = confidences < 0.6
+    summary["content_analysis"]["high_confidence_items"] = int(high.sum())
+    summary["content_analysis"]["medium_confidence_items"] = int((~high & ~low).sum())
+    summary["content_analysis"]["low_confidence_items"] = int(low.sum())
 
     # Save summary
     summary_file = f"{output_dir}/pipeline_summary.json"
-    with open(summary_file, 'w') as f:
-        json.dump(summary, f, indent=2)
+    write_json(summary_file, summary)
 
     print(f"  Summary saved to: {summary_file}")
 
@@ -181,20 +197,29 @@ async def main():
         ("Installation Guide", "installation_guide.pdf", "installation_guide_extracted.json")
     ]
 
-    results = {}
-
+    async def run_document(doc_name, doc_path, extracted_json):
+        try:
+            summary = await test_document_pipeline(doc_name, doc_path, extracted_json)
+            return doc_name, summary
+        except Exception as e:
+            print(f"Error testing {doc_name}: {e}")
+            import traceback
+            traceback.print_exc()
+            return doc_name, None
+
+    pending = []
     for doc_name, doc_path, extracted_json in documents:
         if Path(extracted_json).exists():
-            try:
-                summary = await test_document_pipeline(doc_name, doc_path, extracted_json)
-                results[doc_name] = summary
-            except Exception as e:
-                print(f"Error testing {doc_name}: {e}")
-                import traceback
-                traceback.print_exc()
+            pending.append(run_document(doc_name, doc_path, extracted_json))
         else:
             print(f"Extracted content file not found: {extracted_json}")
 
+    # Run the document pipelines concurrently
+    outcomes = await asyncio.gather(*pending)
+    results = {
+        doc_name: summary for doc_name, summary in outcomes if summary is not None
+    }
+
     # Generate overall summary
     print(f"\n{'='*80}")
     print("OVERALL TEST SUMMARY")
@@ -210,8 +235,7 @@ async def main():
     print(f"Total SME questions generated: {total_questions}")
 
     # Save overall results
-    with open("overall_pipeline_results.json", 'w') as f:
-        json.dump(results, f, indent=2)
+    write_json("overall_pipeline_results.json", results)
 
     print("\nOverall results saved to: overall_pipeline_results.json")
     print("\nPipeline test completed successfully!")
@@ -4,9 +4,26 @@ Test serialization of pipeline results with enum values.
 """
 
 import json
+from datetime import datetime
 from enum import Enum
 
-from ai_doc_gen.ui.app import CustomJSONEncoder, serialize_pipeline_results
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from ai_doc_gen.input_processing.structured_extractor import ContentType, ExtractedContent
+from ai_doc_gen.ui.app import (
+    CustomJSONEncoder,
+    OrjsonProvider,
+    app,
+    jsonify_results,
+    orjson_default,
+    serialize_pipeline_results,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 class TestContentType(Enum):
@@ -43,7 +60,47 @@ def test_serialization():
     print("\nJSON encoded:")
     print(json_str)
 
+    # orjson walks the structure in C and only calls back for unknown types
+    if orjson is not None:
+        orjson_str = orjson.dumps(test_data, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        print("\norjson encoded:")
+        print(orjson_str.decode())
+        assert orjson.loads(orjson_str) == serialized
+
     print("\n✅ Serialization test completed successfully!")
 
+def test_jsonify_results_matches_serialized():
+    """Test that API results encode the same with or without the Python pre-walk."""
+    results = {
+        'status': TestContentType.PROCEDURE,
+        'pipeline_results': {
+            'content': [ExtractedContent(
+                content_type=ContentType.WARNING,
+                title='Grounding',
+                content='Ground the chassis before powering on.',
+                confidence=0.9,
+                source_section='Safety'
+            )],
+            'created': datetime(2024, 1, 2, 3, 4, 5)
+        }
+    }
+    expected = json.loads(DefaultJSONProvider(app).dumps(serialize_pipeline_results(results)))
+
+    with app.test_request_context():
+        assert jsonify_results(results).get_json() == expected
+
+def test_orjson_provider_matches_default():
+    """Test that API responses keep Flask's key order and date format under orjson."""
+    pytest.importorskip("orjson")
+
+    payload = {'zeta': 1, 'alpha': {'b': 2, 'a': 1}, 'created': datetime(2024, 1, 2, 3, 4, 5)}
+    expected = DefaultJSONProvider(app).dumps(payload)
+    actual = OrjsonProvider(app).dumps(payload)
+
+    assert json.loads(actual) == json.loads(expected)
+    assert list(json.loads(actual)) == ['alpha', 'created', 'zeta']
+
 if __name__ == "__main__":
     test_serialization()
+    test_jsonify_results_matches_serialized()
+    test_orjson_provider_matches_default()
@@ -13,6 +13,20 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from ai_doc_gen.input_processing.document_parser import DocumentParserFactory
 from ai_doc_gen.utils.serialization import EnhancedJSONEncoder
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _has_table(content):
+    """Whether a section's content includes a table, without stringifying each item."""
+    return any(
+        (isinstance(c, str) and 'Table' in c)
+        or (isinstance(c, dict) and c.get('type') == 'table')
+        for c in content
+    )
+
 
 def test_web_ui_upload_simulation():
     """Simulate web UI upload process with enhanced HTML parser."""
@@ -53,10 +67,15 @@ def test_web_ui_upload_simulation():
             return False
 
         parsed_doc = parser.parse(uploaded_file)
+        # Section stats are reused by every step below, so compute them once
+        content_items_total = sum(len(s['content']) for s in parsed_doc.sections)
+        table_flags = [_has_table(s['content']) for s in parsed_doc.sections]
+        table_sections_total = sum(table_flags)
+
         print("✅ Enhanced parser processed uploaded file")
         print(f"   - Sections extracted: {len(parsed_doc.sections)}")
-        print(f"   - Content items: {sum(len(s['content']) for s in parsed_doc.sections)}")
-        print(f"   - Table sections: {len([s for s in parsed_doc.sections if any('Table' in str(c) for c in s['content'])])}")
+        print(f"   - Content items: {content_items_total}")
+        print(f"   - Table sections: {table_sections_total}")
 
         # Step 3: Prepare for web UI display
         print("\n📊 Step 3: Preparing for Web UI Display")
@@ -71,8 +90,8 @@ def test_web_ui_upload_simulation():
             "metadata": parsed_doc.metadata,
             "stats": {
                 "total_sections": len(parsed_doc.sections),
-                "content_items": sum(len(s['content']) for s in parsed_doc.sections),
-                "table_sections": len([s for s in parsed_doc.sections if any('Table' in str(c) for c in s['content'])]),
+                "content_items": content_items_total,
+                "table_sections": table_sections_total,
                 "enhanced_source": len([s for s in parsed_doc.sections if s.get('source') == 'html_enhanced'])
             }
         }
@@ -82,10 +101,16 @@ def test_web_ui_upload_simulation():
         print("-" * 40)
 
         encoder = EnhancedJSONEncoder()
-        serialized_data = encoder.encode(web_ui_data)
+        if orjson is not None:
+            # orjson falls back to the encoder's hook for types it can't handle natively
+            serialized_data = orjson.dumps(
+                web_ui_data, default=encoder.default, option=orjson.OPT_NON_STR_KEYS
+            )
+        else:
+            serialized_data = encoder.encode(web_ui_data).encode()
 
         print("✅ Data serialized for web UI")
-        print(f"   - Serialized size: {len(serialized_data)} characters")
+        print(f"   - Serialized size: {len(serialized_data)} bytes")
         print(f"   - JSON valid: {json.loads(serialized_data) is not None}")
 
         # Step 5: Save web UI ready data
@@ -93,7 +118,7 @@ def test_web_ui_upload_simulation():
         print("-" * 40)
 
         output_file = "web_ui_enhanced_parser_data.json"
-        with open(output_file, 'w') as f:
+        with open(output_file, 'wb') as f:
             f.write(serialized_data)
 
         print(f"✅ Web UI data saved to: {output_file}")
@@ -110,8 +135,8 @@ def test_web_ui_upload_simulation():
                 "file_type": "html",
                 "title": parsed_doc.title,
                 "sections_count": len(parsed_doc.sections),
-                "content_items": sum(len(s['content']) for s in parsed_doc.sections),
-                "table_sections": len([s for s in parsed_doc.sections if any('Table' in str(c) for c in s['content'])]),
+                "content_items": content_items_total,
+                "table_sections": table_sections_total,
                 "enhanced_features": {
                     "pandas_integration": True,
                     "beautifulsoup_enhanced": True,
@@ -124,15 +149,19 @@ def test_web_ui_upload_simulation():
                     "heading": s['heading'],
                     "level": s['level'],
                     "content_count": len(s['content']),
-                    "has_tables": any('Table' in str(c) for c in s['content'])
+                    "has_tables": has_tables
                 }
-                for s in parsed_doc.sections[:10]
+                for s, has_tables in zip(parsed_doc.sections[:10], table_flags)
             ]
         }
 
         response_file = "web_ui_response_sample.json"
-        with open(response_file, 'w') as f:
-            json.dump(web_ui_response, f, indent=2, default=str)
+        if orjson is not None:
+            with open(response_file, 'wb') as f:
+                f.write(orjson.dumps(web_ui_response, default=str, option=orjson.OPT_INDENT_2))
+        else:
+            with open(response_file, 'w') as f:
+                json.dump(web_ui_response, f, indent=2, default=str)
 
         print(f"✅ Web UI response sample saved to: {response_file}")
 
@@ -143,8 +172,8 @@ def test_web_ui_upload_simulation():
         print("🎯 Enhanced HTML Parser Results for Web UI:")
         print(f"   📄 File: {os.path.basename(uploaded_file)}")
         print(f"   📊 Sections: {len(parsed_doc.sections)}")
-        print(f"   📝 Content Items: {sum(len(s['content']) for s in parsed_doc.sections)}")
-        print(f"   📋 Table Sections: {len([s for s in parsed_doc.sections if any('Table' in str(c) for c in s['content'])])}")
+        print(f"   📝 Content Items: {content_items_total}")
+        print(f"   📋 Table Sections: {table_sections_total}")
         print("   🔧 Enhanced Features: Pandas + BeautifulSoup")
         print("   ✅ Web UI Ready: Yes")
 
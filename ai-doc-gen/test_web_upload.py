@@ -3,94 +3,126 @@
 Test script for web upload functionality.
 """
 
+import asyncio
+import importlib.util
+import io
+import logging
+import mimetypes
 import os
+import socket
+import sys
 import time
-import requests
+import httpx
+import pytest
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Get the web UI port from environment variable
 WEB_PORT = os.getenv('WEB_PORT', '5476')
 BASE_URL = f'http://localhost:{WEB_PORT}'
 
-def test_web_upload():
-    """Test the web upload functionality."""
-    print("🧪 Testing Web Upload Functionality")
-    print("=" * 50)
-    
-    # Test 1: Check if the web UI is running
-    print("1. Checking if web UI is running...")
-    try:
-        response = requests.get(f'{BASE_URL}/')
-        if response.status_code == 200:
-            print("✅ Web UI is running")
-        else:
-            print(f"❌ Web UI returned status code: {response.status_code}")
-            return False
-    except requests.exceptions.ConnectionError:
-        print("❌ Web UI is not running")
-        print(f"💡 Start it with: cd ai-doc-gen && podman-compose up -d")
-        return False
-    
-    # Test 2: Upload a test PDF
-    print("\n2. Testing PDF upload...")
-    test_pdf = Path("examples/cisco_nexus_9000_series.pdf")
-    
-    if not test_pdf.exists():
-        print(f"❌ Test PDF not found: {test_pdf}")
-        return False
-    
+# Upload payload and form field; override to exercise other upload variants
+TEST_UPLOAD_FILE = Path(os.getenv('TEST_UPLOAD_FILE', 'examples/cisco_nexus_9000_series.pdf'))
+UPLOAD_FIELD = os.getenv('UPLOAD_FIELD', 'document')
+
+# Uploaded straight from memory when no payload file is available, so nothing is written to disk
+IN_MEMORY_UPLOAD = ('test_upload.txt', b"This is a test document for upload testing.", 'text/plain')
+
+# HTTP/2 needs the optional h2 package; without it httpx still reuses one HTTP/1.1 connection
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# Bound every HTTP call so a hung server cannot block the run: 2s connect, 10s read
+HTTP_TIMEOUT = httpx.Timeout(10.0, connect=2.0)
+
+# Result polling backoff: start fast for quick jobs, back off for slow ones
+POLL_INITIAL_DELAY = 0.25
+POLL_MAX_DELAY = 2.0
+
+def web_ui_listening(timeout=1.0):
+    """Cheap TCP connect probe: is anything accepting connections on the web UI port?"""
     try:
-        with open(test_pdf, 'rb') as f:
-            files = {'file': (test_pdf.name, f, 'application/pdf')}
-            response = requests.post(f'{BASE_URL}/upload', files=files)
-        
-        if response.status_code == 200:
-            result = response.json()
-            job_id = result.get('job_id')
-            print(f"✅ Upload successful, job ID: {job_id}")
-        else:
-            print(f"❌ Upload failed with status code: {response.status_code}")
-            return False
-    except Exception as e:
-        print(f"❌ Upload error: {e}")
+        socket.create_connection(('localhost', int(WEB_PORT)), timeout=timeout).close()
+        return True
+    except OSError:
         return False
-    
-    # Test 3: Check processing results
-    print("\n3. Checking processing results...")
-    max_wait = 60  # Wait up to 60 seconds
-    start_time = time.time()
-    
-    while time.time() - start_time < max_wait:
-        try:
-            results_response = requests.get(f'{BASE_URL}/results/{job_id}')
-            if results_response.status_code == 200:
-                results = results_response.json()
-                status = results.get('status')
-                
-                if status == 'completed':
-                    print("✅ Processing completed successfully")
-                    print(f"📊 Confidence: {results.get('confidence', 'N/A')}")
-                    return True
-                elif status == 'failed':
-                    print(f"❌ Processing failed: {results.get('error', 'Unknown error')}")
-                    return False
-                else:
-                    print(f"⏳ Processing status: {status}")
-                    time.sleep(2)
-            else:
-                print(f"❌ Failed to get results: {results_response.status_code}")
-                return False
-        except Exception as e:
-            print(f"❌ Error checking results: {e}")
-            return False
-    
-    print("❌ Processing timed out")
-    return False
 
-if __name__ == "__main__":
-    success = test_web_upload()
-    if success:
-        print("\n🎉 All tests passed!")
+async def run_web_upload():
+    """Test the web upload functionality over a single shared client connection."""
+    print("🧪 Testing Web Upload Functionality")
+    print("=" * 50)
+
+    test_file = TEST_UPLOAD_FILE
+    if test_file.exists():
+        upload_name = test_file.name
+        content_type = mimetypes.guess_type(upload_name)[0] or 'application/octet-stream'
+    elif 'TEST_UPLOAD_FILE' in os.environ:
+        raise AssertionError(f"Test file not found: {test_file}")
     else:
-        print("\n❌ Tests failed!")
-        exit(1)
+        # Default example PDF not checked out: fall back to the in-memory document
+        upload_name, upload_bytes, content_type = IN_MEMORY_UPLOAD
+
+    async with httpx.AsyncClient(base_url=BASE_URL, http2=HTTP2_AVAILABLE, timeout=HTTP_TIMEOUT) as client:
+        # Tests 1 and 2 overlap: the liveness check and the upload share the connection
+        print("1. Checking if web UI is running...")
+        print(f"2. Testing upload of {upload_name}...")
+        with open(test_file, 'rb') if test_file.exists() else io.BytesIO(upload_bytes) as f:
+            response, upload_response = await asyncio.gather(
+                client.get('/'),
+                client.post('/upload', files={UPLOAD_FIELD: (upload_name, f, content_type)}),
+                return_exceptions=True
+            )
+
+        # Test 1: Check if the web UI is running
+        if isinstance(response, Exception):
+            raise AssertionError(f"Web UI check error: {response}") from response
+        assert response.status_code == 200, f"Web UI returned status code: {response.status_code}"
+        print("✅ Web UI is running")
+
+        # Test 2: Upload a test document
+        if isinstance(upload_response, Exception):
+            raise AssertionError(f"Upload error: {upload_response}") from upload_response
+        assert upload_response.status_code == 200, \
+            f"Upload failed with status code: {upload_response.status_code}"
+        job_id = upload_response.json().get('job_id')
+        print(f"✅ Upload successful, job ID: {job_id}")
+
+        # Test 3: Check processing results
+        print("\n3. Checking processing results...")
+        max_wait = 60  # Wait up to 60 seconds
+        start_time = time.time()
+        delay = POLL_INITIAL_DELAY
+
+        while time.time() - start_time < max_wait:
+            try:
+                results_response = await client.get(f'/results/{job_id}')
+                results = results_response.json() if results_response.status_code == 200 else None
+            except Exception as e:
+                raise AssertionError(f"Error checking results: {e}") from e
+            assert results is not None, f"Failed to get results: {results_response.status_code}"
+
+            status = results.get('status')
+            if status == 'completed':
+                logger.info("✅ Processing completed successfully")
+                logger.info("📊 Confidence: %s", results.get('confidence', 'N/A'))
+                return
+            assert status != 'failed', f"Processing failed: {results.get('error', 'Unknown error')}"
+
+            logger.debug("⏳ Processing status: %s", status)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_DELAY)
+
+    raise AssertionError("Processing timed out")
+
+def test_web_upload():
+    """Test the web upload functionality."""
+    if not web_ui_listening():
+        pytest.skip(f"Web UI not running on port {WEB_PORT}; start it with: "
+                    f"cd ai-doc-gen && podman-compose up -d")
+    asyncio.run(run_web_upload())
+
+if __name__ == "__main__":
+    # Poll loop reports through logging; pass LOG_LEVEL=DEBUG to see each status update
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    sys.exit(pytest.main([__file__, "-v", "-o", "log_cli=true",
+                          f"--log-cli-level={os.getenv('LOG_LEVEL', 'INFO')}"]))
@@ -0,0 +1,22 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+
+import pytest
+
+# Extensions the parser and validator tests need a file on disk for
+FAKE_FILE_EXTENSIONS = ('.pdf', '.docx', '.xml', '.xyz', '.txt')
+
+
+@pytest.fixture(scope="session")
+def fake_files(tmp_path_factory):
+    """Small placeholder files keyed by extension, created once per session.
+
+    The files are 100 bytes each: enough to exist for ``can_parse`` checks
+    while staying below the validator's minimum file size.
+    """
+    directory = tmp_path_factory.mktemp("fake_files")
+    paths = {ext: directory / f"sample{ext}" for ext in FAKE_FILE_EXTENSIONS}
+    for path in paths.values():
+        path.write_bytes(b"x" * 100)
+    return {ext: str(path) for ext, path in paths.items()}
@@ -2,6 +2,7 @@
 Tests for AI agents (ManagingAgent and ReviewAgent).
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import pytest
@@ -13,6 +14,66 @@ from ai_doc_gen.input_processing.structured_extractor import (
 )
 
 
+@pytest.fixture(scope="module")
+def tech_spec():
+    """Technical specification item shared across the module."""
+    return ExtractedContent(
+        content_type=ContentType.TECHNICAL_SPEC,
+        title="Spec 1",
+        content="Test specification content",
+        confidence=0.8,
+        source_section="Section 1"
+    )
+
+
+@pytest.fixture(scope="module")
+def install_proc():
+    """Installation procedure item shared across the module."""
+    return ExtractedContent(
+        content_type=ContentType.INSTALLATION_PROCEDURE,
+        title="Install 1",
+        content="Test installation content",
+        confidence=0.6,
+        source_section="Section 2"
+    )
+
+
+@pytest.fixture(scope="module")
+def low_conf_spec():
+    """Specification below the 85% review threshold."""
+    return ExtractedContent(
+        content_type=ContentType.TECHNICAL_SPEC,
+        title="Low Confidence Spec",
+        content="Test content",
+        confidence=0.7,
+        source_section="Section 1"
+    )
+
+
+@pytest.fixture(scope="module")
+def high_conf_install():
+    """Installation procedure above the 85% review threshold."""
+    return ExtractedContent(
+        content_type=ContentType.INSTALLATION_PROCEDURE,
+        title="High Confidence Install",
+        content="Test content",
+        confidence=0.9,
+        source_section="Section 2"
+    )
+
+
+@pytest.fixture(scope="module")
+def report_item():
+    """Minimal item used by the report tests."""
+    return ExtractedContent(
+        content_type=ContentType.TECHNICAL_SPEC,
+        title="Test",
+        content="Test content",
+        confidence=0.8,
+        source_section="Test Section"
+    )
+
+
 class TestManagingAgent:
     """Test ManagingAgent functionality."""
 
@@ -27,27 +88,11 @@ class TestManagingAgent:
         agent = ManagingAgent(name="CustomAgent")
         assert agent.name == "CustomAgent"
 
-    def test_managing_agent_run_with_content(self):
+    def test_managing_agent_run_with_content(self, tech_spec, install_proc):
         """Test ManagingAgent run method with extracted content."""
         agent = ManagingAgent()
 
-        # Create mock extracted content
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Spec 1",
-                content="Test specification content",
-                confidence=0.8,
-                source_section="Section 1"
-            ),
-            ExtractedContent(
-                content_type=ContentType.INSTALLATION_PROCEDURE,
-                title="Install 1",
-                content="Test installation content",
-                confidence=0.6,
-                source_section="Section 2"
-            )
-        ]
+        content_items = [tech_spec, install_proc]
 
         results = agent.run(content_items)
 
@@ -79,7 +124,7 @@ class TestManagingAgent:
         assert "severity" in questions[0]
         assert "gap_type" in questions[0]
 
-    def test_managing_agent_report(self):
+    def test_managing_agent_report(self, report_item):
         """Test ManagingAgent report method."""
         agent = ManagingAgent()
 
@@ -88,15 +133,7 @@ class TestManagingAgent:
         assert "message" in report
 
         # Test report after running
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Test",
-                content="Test content",
-                confidence=0.8,
-                source_section="Test Section"
-            )
-        ]
+        content_items = [report_item]
 
         agent.run(content_items)
         report = agent.report()
@@ -117,26 +154,13 @@ class TestReviewAgent:
         agent = ReviewAgent(name="CustomReviewAgent")
         assert agent.name == "CustomReviewAgent"
 
-    def test_review_agent_run_with_content(self):
+    def test_review_agent_run_with_content(self, tech_spec, install_proc):
         """Test ReviewAgent run method with extracted content."""
         agent = ReviewAgent()
 
-        # Create mock extracted content
         content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Spec 1",
-                content="Test specification content",
-                confidence=0.9,
-                source_section="Section 1"
-            ),
-            ExtractedContent(
-                content_type=ContentType.INSTALLATION_PROCEDURE,
-                title="Install 1",
-                content="Test installation content",
-                confidence=0.7,
-                source_section="Section 2"
-            )
+            tech_spec.model_copy(update={"confidence": 0.9}),
+            install_proc.model_copy(update={"confidence": 0.7})
         ]
 
         results = agent.run(content_items)
@@ -147,19 +171,11 @@ class TestReviewAgent:
         assert results["total_items"] == 2
         assert len(results["audit_results"]) == 2
 
-    def test_review_agent_run_with_provenance(self):
+    def test_review_agent_run_with_provenance(self, tech_spec):
         """Test ReviewAgent run method with provenance mapping."""
         agent = ReviewAgent()
 
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Spec 1",
-                content="Test content",
-                confidence=0.8,
-                source_section="Section 1"
-            )
-        ]
+        content_items = [tech_spec]
 
         provenance_map = {"Spec 1": "source_document.pdf"}
 
@@ -169,19 +185,11 @@ class TestReviewAgent:
         assert len(results["audit_results"]) == 1
         assert results["audit_results"][0]["has_provenance"] is True
 
-    def test_review_agent_run_without_provenance(self):
+    def test_review_agent_run_without_provenance(self, tech_spec):
         """Test ReviewAgent run method without provenance mapping."""
         agent = ReviewAgent()
 
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Spec 1",
-                content="Test content",
-                confidence=0.8,
-                source_section="Section 1"
-            )
-        ]
+        content_items = [tech_spec]
 
         results = agent.run(content_items)
 
@@ -189,26 +197,11 @@ class TestReviewAgent:
         assert len(results["audit_results"]) == 1
         assert results["audit_results"][0]["has_provenance"] is False
 
-    def test_review_agent_low_confidence_detection(self):
+    def test_review_agent_low_confidence_detection(self, low_conf_spec, high_conf_install):
         """Test ReviewAgent detection of low confidence items."""
         agent = ReviewAgent()
 
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Low Confidence Spec",
-                content="Test content",
-                confidence=0.7,  # Below 85% threshold
-                source_section="Section 1"
-            ),
-            ExtractedContent(
-                content_type=ContentType.INSTALLATION_PROCEDURE,
-                title="High Confidence Install",
-                content="Test content",
-                confidence=0.9,  # Above 85% threshold
-                source_section="Section 2"
-            )
-        ]
+        content_items = [low_conf_spec, high_conf_install]
 
         results = agent.run(content_items)
 
@@ -216,7 +209,7 @@ class TestReviewAgent:
         assert "Low Confidence Spec" in results["low_confidence"]
         assert "High Confidence Install" not in results["low_confidence"]
 
-    def test_review_agent_report(self):
+    def test_review_agent_report(self, report_item):
         """Test ReviewAgent report method."""
         agent = ReviewAgent()
 
@@ -225,15 +218,7 @@ class TestReviewAgent:
         assert "message" in report
 
         # Test report after running
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Test",
-                content="Test content",
-                confidence=0.8,
-                source_section="Test Section"
-            )
-        ]
+        content_items = [report_item]
 
         agent.run(content_items)
         report = agent.report()
@@ -266,11 +251,12 @@ class TestAgentIntegration:
             )
         ]
 
-        # Run managing agent
-        managing_results = managing_agent.run(content_items)
-
-        # Run review agent
-        review_results = review_agent.run(content_items)
+        # Run both agents concurrently; neither mutates the content items
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            managing_future = executor.submit(managing_agent.run, content_items)
+            review_future = executor.submit(review_agent.run, content_items)
+            managing_results = managing_future.result()
+            review_results = review_future.result()
 
         # Verify both agents produced results
         assert managing_results["total_content_items"] == 2
@@ -284,20 +270,12 @@ class TestAgentIntegration:
         assert "audit_results" in review_results
         assert len(review_results["audit_results"]) == 2
 
-    def test_agent_reports(self):
+    def test_agent_reports(self, report_item):
         """Test that both agents can generate reports."""
         managing_agent = ManagingAgent()
         review_agent = ReviewAgent()
 
-        content_items = [
-            ExtractedContent(
-                content_type=ContentType.TECHNICAL_SPEC,
-                title="Test",
-                content="Test content",
-                confidence=0.8,
-                source_section="Test Section"
-            )
-        ]
+        content_items = [report_item]
 
         # Run both agents
         managing_agent.run(content_items)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Property-based fuzz tests for cache poisoning protection in LLM utility.
+
+Complements the hand-curated inputs in test_cache_poisoning.py with
+generated ones; the deadline also catches validators regressing to
+backtracking-prone patterns.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("hypothesis")
+
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_doc_gen.utils.llm import LLMUtility
+
+DANGEROUS_TITLE_CHARS = '/\\~*?"<>|'
+DANGEROUS_SYNONYM_CHARS = '~|&;`$(){}'
+
+# Every generated example must finish within 50ms
+FUZZ_SETTINGS = settings(deadline=50)
+
+
+def _embedding(dangerous):
+    """Text with at least one of the given dangerous strings somewhere inside."""
+    return st.tuples(
+        st.text(max_size=80), st.sampled_from(dangerous), st.text(max_size=80)
+    ).map("".join)
+
+
+@pytest.fixture(scope="module")
+def shared_llm(tmp_path_factory):
+    """LLM utility shared by the fuzz tests, which never touch the cache."""
+    return LLMUtility(
+        cache_dir=str(tmp_path_factory.mktemp("fuzz_cache")),
+        cache_ttl_hours=1,
+        cache_version="1.0"
+    )
+
+
+@FUZZ_SETTINGS
+@given(title=_embedding(list(DANGEROUS_TITLE_CHARS) + [".."]))
+def test_validation_rejects_dangerous(shared_llm, title):
+    """Any title carrying a forbidden character or '..' is rejected."""
+    with pytest.raises(ValueError):
+        shared_llm._validate_input(title)
+
+
+@FUZZ_SETTINGS
+@given(title=st.text(min_size=201, max_size=1000).filter(lambda s: len(s.strip()) > 200))
+def test_validation_rejects_long_titles(shared_llm, title):
+    """Any title over 200 characters after stripping is rejected."""
+    with pytest.raises(ValueError):
+        shared_llm._validate_input(title)
+
+
+@FUZZ_SETTINGS
+@given(title=st.text(
+    alphabet=st.characters(blacklist_characters=DANGEROUS_TITLE_CHARS + "."), max_size=200
+))
+def test_validation_accepts_clean_titles(shared_llm, title):
+    """Titles without forbidden characters come back stripped, not rejected."""
+    assert shared_llm._validate_input(title) == title.strip()
+
+
+@FUZZ_SETTINGS
+@given(synonym=_embedding(list(DANGEROUS_SYNONYM_CHARS)))
+def test_synonym_validation_drops_dangerous(shared_llm, synonym):
+    """Synonyms carrying shell or template metacharacters are filtered out."""
+    assert shared_llm._validate_synonyms([synonym]) == []
+
+
+@FUZZ_SETTINGS
+@given(title=st.text(max_size=300))
+def test_cache_key_generation_safety(shared_llm, title):
+    """Cache keys stay plain file names whatever the title."""
+    cache_key = shared_llm._generate_cache_key(title)
+    assert cache_key.startswith("synonyms_") and cache_key.endswith(".json")
+    assert ".." not in cache_key
+    assert not any(char in cache_key for char in DANGEROUS_TITLE_CHARS)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
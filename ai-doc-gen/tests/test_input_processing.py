@@ -4,11 +4,10 @@ Tests for input processing module.
 Tests document parsing, structured extraction, and validation functionality.
 """
 
-import os
-import tempfile
 from unittest.mock import Mock, patch
 
 import pytest
+from pydantic import ValidationError
 
 from ai_doc_gen.input_processing import (
     InputValidator,
@@ -21,6 +20,7 @@ from ai_doc_gen.input_processing.document_parser import (
     DocumentParserFactory,
     DOCXParser,
     PDFParser,
+    TextParser,
     XMLParser,
 )
 from ai_doc_gen.input_processing.input_validator import (
@@ -34,6 +34,18 @@ from ai_doc_gen.input_processing.structured_extractor import (
 )
 
 
+@pytest.fixture(scope="module")
+def extractor():
+    """Structured extractor shared by the module, built once."""
+    return StructuredExtractor()
+
+
+@pytest.fixture(scope="module")
+def validator():
+    """Input validator shared by the module, built once."""
+    return InputValidator()
+
+
 class TestDocumentParser:
     """Test document parsing functionality."""
 
@@ -71,42 +83,25 @@ class TestDocumentParser:
         parser = factory.get_parser("nonexistent.txt")
         assert parser is None
 
-    @patch('ai_doc_gen.input_processing.document_parser.PDF_AVAILABLE', True)
-    def test_pdf_parser_can_parse(self):
-        """Test PDF parser can_parse method."""
-        parser = PDFParser()
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
-            temp_file = f.name
-        try:
-            assert parser.can_parse(temp_file) is True
-            assert parser.can_parse("test.txt") is False
-            assert parser.can_parse("nonexistent.pdf") is False
-        finally:
-            os.unlink(temp_file)
-
-    @patch('ai_doc_gen.input_processing.document_parser.DOCX_AVAILABLE', True)
-    def test_docx_parser_can_parse(self):
-        """Test DOCX parser can_parse method."""
-        parser = DOCXParser()
-        with tempfile.NamedTemporaryFile(suffix='.docx', delete=False) as f:
-            temp_file = f.name
-        try:
-            assert parser.can_parse(temp_file) is True
-            assert parser.can_parse("test.txt") is False
-        finally:
-            os.unlink(temp_file)
-
-    @patch('ai_doc_gen.input_processing.document_parser.XML_AVAILABLE', True)
-    def test_xml_parser_can_parse(self):
-        """Test XML parser can_parse method."""
-        parser = XMLParser()
-        with tempfile.NamedTemporaryFile(suffix='.xml', delete=False) as f:
-            temp_file = f.name
-        try:
-            assert parser.can_parse(temp_file) is True
-            assert parser.can_parse("test.txt") is False
-        finally:
-            os.unlink(temp_file)
+    def test_parser_factory_dispatches_by_extension(self, fake_files):
+        """Test factory picks the parser registered for the file extension."""
+        factory = DocumentParserFactory()
+        assert isinstance(factory.get_parser(fake_files['.txt']), TextParser)
+        assert factory.get_parser(fake_files['.xyz']) is None
+        assert "TXT" in factory.get_supported_formats()
+
+    @pytest.mark.parametrize("parser_cls,suffix,flag", [
+        (PDFParser, '.pdf', 'PDF_AVAILABLE'),
+        (DOCXParser, '.docx', 'DOCX_AVAILABLE'),
+        (XMLParser, '.xml', 'XML_AVAILABLE'),
+    ])
+    def test_parser_can_parse(self, parser_cls, suffix, flag, fake_files, monkeypatch):
+        """Test each parser's can_parse method against its own extension."""
+        monkeypatch.setattr(f'ai_doc_gen.input_processing.document_parser.{flag}', True)
+        parser = parser_cls()
+        assert parser.can_parse(fake_files[suffix]) is True
+        assert parser.can_parse("test.txt") is False
+        assert parser.can_parse(f"nonexistent{suffix}") is False
 
 
 class TestStructuredExtractor:
@@ -138,10 +133,40 @@ class TestStructuredExtractor:
         assert content.title == "Test Spec"
         assert content.confidence == 0.8
 
-    def test_classify_content_technical_spec(self):
-        """Test content classification for technical specifications."""
-        extractor = StructuredExtractor()
+    def test_extracted_content_is_frozen(self):
+        """Test extracted content is immutable and copied for updates."""
+        content = ExtractedContent(
+            content_type=ContentType.TECHNICAL_SPEC,
+            title="Test Spec",
+            content="Test content",
+            confidence=0.8,
+            source_section="Test Section"
+        )
+        with pytest.raises(ValidationError):
+            content.confidence = 0.5
 
+        updated = content.model_copy(update={"confidence": 0.5})
+        assert updated.confidence == 0.5
+        assert content.confidence == 0.8
+
+    def test_extracted_content_interns_source_section(self):
+        """Test equal section names from separate strings share one object."""
+        heading = "".join(["Power ", "Requirements"])
+        items = [
+            ExtractedContent(
+                content_type=ContentType.REQUIREMENT,
+                title="Req",
+                content=f"Content {i}",
+                confidence=0.5,
+                source_section="".join(["Power ", "Requirements"])
+            )
+            for i in range(2)
+        ]
+        assert items[0].source_section is items[1].source_section
+        assert items[0].source_section == heading
+
+    def test_classify_content_technical_spec(self, extractor):
+        """Test content classification for technical specifications."""
         text = "Technical Specifications: Dimensions 100mm x 200mm, Weight 2.5kg"
         result = extractor._classify_content(text, "Test Section")
 
@@ -149,10 +174,8 @@ class TestStructuredExtractor:
         assert result.content_type == ContentType.TECHNICAL_SPEC
         assert result.confidence > 0.1
 
-    def test_classify_content_installation(self):
+    def test_classify_content_installation(self, extractor):
         """Test content classification for installation procedures."""
-        extractor = StructuredExtractor()
-
         text = "Installation Procedure: Step 1. Mount the device. Step 2. Connect cables."
         result = extractor._classify_content(text, "Test Section")
 
@@ -160,10 +183,8 @@ class TestStructuredExtractor:
         assert result.content_type == ContentType.INSTALLATION_PROCEDURE
         assert result.confidence > 0.1
 
-    def test_classify_content_warning(self):
+    def test_classify_content_warning(self, extractor):
         """Test content classification for warnings."""
-        extractor = StructuredExtractor()
-
         text = "WARNING: Do not connect power while device is open."
         result = extractor._classify_content(text, "Test Section")
 
@@ -171,10 +192,23 @@ class TestStructuredExtractor:
         assert result.content_type == ContentType.WARNING
         assert result.confidence > 0.1
 
-    def test_extract_title(self):
-        """Test title extraction."""
+    def test_classify_content_memoized(self):
+        """Test repeated text and context reuse the first classification."""
         extractor = StructuredExtractor()
+        text = "Technical Specifications: Dimensions 100mm x 200mm, Weight 2.5kg"
+
+        with patch.object(extractor, '_classify_content_uncached',
+                          wraps=extractor._classify_content_uncached) as mock_classify:
+            first = extractor._classify_content(text, "Section A")
+            second = extractor._classify_content(text, "Section A")
+            other = extractor._classify_content(text, "Section B")
 
+        assert second is first
+        assert other.source_section == "Section B"
+        assert mock_classify.call_count == 2
+
+    def test_extract_title(self, extractor):
+        """Test title extraction."""
         # Test with short title-like text
         text = "Installation Guide:\nThis is the content."
         title = extractor._extract_title(text)
@@ -186,10 +220,8 @@ class TestStructuredExtractor:
         assert "..." in title
         assert len(title.split()) <= 5
 
-    def test_extract_tags(self):
+    def test_extract_tags(self, extractor):
         """Test tag extraction."""
-        extractor = StructuredExtractor()
-
         text = "Cisco router with 100V power supply and 1GB memory"
         tags = extractor._extract_tags(text, ContentType.TECHNICAL_SPEC)
 
@@ -197,19 +229,35 @@ class TestStructuredExtractor:
         assert "100V" in tags
         assert "1GB" in tags
 
-    def test_calculate_keyword_score(self):
-        """Test keyword scoring."""
-        extractor = StructuredExtractor()
+    def test_extract_tags_measurements(self, extractor):
+        """Test every measurement family is tagged once, without partial numbers."""
+        text = "Chassis 440 mm deep, 2.5kg, 100-240V at 50Hz with 16 GB memory"
+        tags = extractor._extract_tags(text, ContentType.TECHNICAL_SPEC)
+
+        assert {"440 mm", "2.5kg", "240V", "50Hz", "16 GB"} <= set(tags)
+        assert "5kg" not in tags
 
+    def test_calculate_keyword_score(self, extractor):
+        """Test keyword scoring."""
         text = "The device has dimensions of 100mm x 200mm and weighs 2.5kg"
         score = extractor._calculate_keyword_score(text, ContentType.TECHNICAL_SPEC)
 
         assert score > 0.0
 
-    def test_deduplicate_content(self):
-        """Test content deduplication."""
-        extractor = StructuredExtractor()
+    def test_find_terms_without_automaton(self, extractor):
+        """Test substring fallback finds the same terms as the automaton."""
+        text = "Connect the Cisco router power cable; check voltage and clearance"
+        expected = {'connect', 'cisco', 'router', 'power', 'voltage', 'clearance'}
+
+        with patch('ai_doc_gen.input_processing.structured_extractor.AHOCORASICK_AVAILABLE', False):
+            fallback = StructuredExtractor()
 
+        assert fallback._term_automaton is None
+        assert fallback._find_terms(text.lower()) == extractor._find_terms(text.lower())
+        assert expected <= fallback._find_terms(text.lower())
+
+    def test_deduplicate_content(self, extractor):
+        """Test content deduplication."""
         # Create duplicate content items
         content1 = ExtractedContent(
             content_type=ContentType.TECHNICAL_SPEC,
@@ -228,11 +276,10 @@ class TestStructuredExtractor:
 
         unique = extractor._deduplicate_content([content1, content2])
         assert len(unique) == 1
+        assert unique[0].confidence == 0.9
 
-    def test_get_content_summary(self):
+    def test_get_content_summary(self, extractor):
         """Test content summary generation."""
-        extractor = StructuredExtractor()
-
         content_items = [
             ExtractedContent(
                 content_type=ContentType.TECHNICAL_SPEC,
@@ -302,9 +349,8 @@ class TestInputValidator:
         assert result.is_valid is True
         assert result.score == 0.8
 
-    def test_validate_nonexistent_file(self):
+    def test_validate_nonexistent_file(self, validator):
         """Test validation of non-existent file."""
-        validator = InputValidator()
         result = validator.validate_document("nonexistent.pdf")
 
         assert result.is_valid is False
@@ -312,39 +358,22 @@ class TestInputValidator:
         assert len(result.issues) > 0
         assert any(issue.level == ValidationLevel.CRITICAL for issue in result.issues)
 
-    def test_validate_unsupported_extension(self):
+    def test_validate_unsupported_extension(self, validator, fake_files):
         """Test validation of unsupported file extension."""
-        validator = InputValidator()
-        with tempfile.NamedTemporaryFile(suffix='.xyz', delete=False) as f:
-            temp_file = f.name
-        try:
-            result = validator.validate_document(temp_file)
-            assert result.is_valid is False
-            assert len(result.issues) > 0
-            assert any(issue.field == "file_extension" for issue in result.issues)
-        finally:
-            os.unlink(temp_file)
-
-    def test_validate_file_size(self):
-        """Test file size validation."""
-        validator = InputValidator()
-
-        # Create a temporary file that's too small
-        with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as f:
-            f.write(b"x" * 100)  # 100 bytes, below minimum
-            temp_file = f.name
+        result = validator.validate_document(fake_files['.xyz'])
+        assert result.is_valid is False
+        assert len(result.issues) > 0
+        assert any(issue.field == "file_extension" for issue in result.issues)
 
-        try:
-            result = validator.validate_document(temp_file)
-            assert len(result.issues) > 0
-            assert any(issue.field == "file_size" for issue in result.issues)
-        finally:
-            os.unlink(temp_file)
+    def test_validate_file_size(self, validator, fake_files):
+        """Test file size validation."""
+        # The shared .txt fixture is 100 bytes, below the minimum
+        result = validator.validate_document(fake_files['.txt'])
+        assert len(result.issues) > 0
+        assert any(issue.field == "file_size" for issue in result.issues)
 
-    def test_calculate_duplicate_ratio(self):
+    def test_calculate_duplicate_ratio(self, validator):
         """Test duplicate ratio calculation."""
-        validator = InputValidator()
-
         # Text with duplicates
         text = "Line 1\nLine 2\nLine 1\nLine 3\nLine 2"
         ratio = validator._calculate_duplicate_ratio(text)
@@ -352,10 +381,8 @@ class TestInputValidator:
         assert ratio > 0.0
         assert ratio <= 1.0
 
-    def test_calculate_score(self):
+    def test_calculate_score(self, validator):
         """Test validation score calculation."""
-        validator = InputValidator()
-
         # Test with no issues
         score = validator._calculate_score([])
         assert score == 1.0
@@ -371,10 +398,8 @@ class TestInputValidator:
         assert score < 1.0
         assert score > 0.0
 
-    def test_generate_warnings(self):
+    def test_generate_warnings(self, validator):
         """Test warning generation."""
-        validator = InputValidator()
-
         issues = [
             ValidationIssue(level=ValidationLevel.INFO, message="Info"),
             ValidationIssue(level=ValidationLevel.WARNING, message="Warning", suggestion="Fix it"),
@@ -385,10 +410,8 @@ class TestInputValidator:
         assert len(warnings) == 2  # Warning and Error, not Info
         assert any("Fix it" in warning for warning in warnings)
 
-    def test_generate_recommendations(self):
+    def test_generate_recommendations(self, validator):
         """Test recommendation generation."""
-        validator = InputValidator()
-
         issues = [
             ValidationIssue(level=ValidationLevel.ERROR, message="File error", field="file_path"),
             ValidationIssue(level=ValidationLevel.WARNING, message="Content warning", field="content")
@@ -416,7 +439,7 @@ class TestIntegration:
         """Test validate_document convenience function."""
         assert callable(validate_document)
 
-    def test_end_to_end_processing(self):
+    def test_end_to_end_processing(self, extractor):
         """Test end-to-end processing workflow."""
         # Create a mock parsed document
         mock_doc = Mock()
@@ -436,7 +459,6 @@ class TestIntegration:
         mock_doc.parsing_errors = []
 
         # Test structured extraction
-        extractor = StructuredExtractor()
         extracted = extractor.extract_structured_content(mock_doc)
 
         assert len(extracted) > 0
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Performance budget tests for the LLM utility's cache hot paths.
+
+Wall-clock budgets are deselected by default; run with ``pytest -m perf``.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from ai_doc_gen.utils.llm import LLMUtility
+
+pytestmark = pytest.mark.perf
+
+# Median per-call budgets, in seconds
+VALIDATE_INPUT_BUDGET = 5e-6
+CACHE_HASH_BUDGET = 50e-6
+
+
+@pytest.fixture(scope="module")
+def llm_util(tmp_path_factory):
+    """LLM utility shared by the budget tests, which never touch the cache."""
+    return LLMUtility(
+        cache_dir=str(tmp_path_factory.mktemp("perf_cache")),
+        cache_ttl_hours=1,
+        cache_version="1.0"
+    )
+
+
+def test_validate_input_budget(benchmark, llm_util):
+    """Validating a clean title should stay a single regex scan."""
+    result = benchmark(llm_util._validate_input, "Power over Ethernet")
+    assert result == "Power over Ethernet"
+    assert benchmark.stats.stats.median < VALIDATE_INPUT_BUDGET
+
+
+def test_calculate_cache_hash_budget(benchmark, llm_util):
+    """Hashing a typical cache entry should stay well under a cache file read."""
+    cache_data = {
+        'title': 'Power over Ethernet',
+        'synonyms': ['PoE', '802.3af', 'PoE+'],
+        'model': 'gpt-4',
+        'temperature': 0.2,
+        'prompt': 'Generate synonyms for the section title'
+    }
+    benchmark(llm_util._calculate_cache_hash, cache_data)
+    assert benchmark.stats.stats.median < CACHE_HASH_BUDGET
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, "-m", "perf"]))
@@ -5,11 +5,13 @@ Uses mocked responses to avoid API calls during testing.
 """
 
 import json
-import tempfile
-import unittest
-from unittest.mock import patch, MagicMock
-from pathlib import Path
+import os
 import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -17,183 +19,256 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from ai_doc_gen.utils.llm import LLMUtility
 
 
-class TestLLMUtility(unittest.TestCase):
-    """Test cases for LLMUtility class."""
-    
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.llm_util = LLMUtility(cache_dir=self.temp_dir)
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir)
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_get_synonyms_from_llm_success(self, mock_client):
-        """Test successful synonym generation."""
-        # Mock OpenAI response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = '["PoE", "Power over Ethernet", "802.3af"]'
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        synonyms = self.llm_util.get_synonyms_from_llm("Power over Ethernet")
-        
-        expected = ["PoE", "Power over Ethernet", "802.3af"]
-        self.assertEqual(synonyms, expected)
-        
-        # Verify OpenAI was called
-        mock_client.chat.completions.create.assert_called_once()
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_get_synonyms_from_llm_cached(self, mock_client):
-        """Test that cached synonyms are used."""
-        # Create a cache file
-        cache_data = {
-            'title': 'Power over Ethernet',
-            'synonyms': ['PoE', 'Power over Ethernet'],
-            'model': 'gpt-4',
-            'temperature': 0.2,
-            'prompt': 'test prompt'
-        }
-        
-        cache_path = Path(self.temp_dir) / "synonyms_power_over_ethernet.json"
-        with open(cache_path, 'w') as f:
-            json.dump(cache_data, f)
-        
-        # Should use cache and not call OpenAI
-        synonyms = self.llm_util.get_synonyms_from_llm("Power over Ethernet")
-        
-        self.assertEqual(synonyms, ['PoE', 'Power over Ethernet'])
-        mock_client.chat.completions.create.assert_not_called()
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_get_synonyms_from_llm_parse_fallback(self, mock_client):
-        """Test fallback parsing when eval fails."""
-        # Mock OpenAI response with invalid format
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = 'PoE, Power over Ethernet, 802.3af'
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        synonyms = self.llm_util.get_synonyms_from_llm("Power over Ethernet")
-        
-        # Should extract synonyms using fallback method
-        self.assertIn("PoE", synonyms)
-        self.assertIn("Power over Ethernet", synonyms)
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_get_synonyms_from_llm_no_openai(self, mock_client):
-        """Test behavior when OpenAI is not available."""
-        mock_client.chat.completions.create.side_effect = Exception("API error")
-        
-        synonyms = self.llm_util.get_synonyms_from_llm("Power over Ethernet")
-        
-        self.assertEqual(synonyms, [])
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_match_sections_with_llm_success(self, mock_client):
-        """Test successful section matching."""
-        # Mock OpenAI response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = '''
-        {
-            "match": "Yes",
-            "confidence": 0.95,
-            "reasoning": "PoE is the standard abbreviation for Power over Ethernet"
-        }
-        '''
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        result = self.llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
-        
-        expected = {
-            'match': 'Yes',
-            'confidence': 0.95,
-            'reasoning': 'PoE is the standard abbreviation for Power over Ethernet'
-        }
-        self.assertEqual(result, expected)
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_match_sections_with_llm_parse_fallback(self, mock_client):
-        """Test fallback parsing for match response."""
-        # Mock OpenAI response with invalid JSON
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = '''
-        Match: Yes
-        Confidence: 0.85
-        Reasoning: Good match
-        '''
-        mock_client.chat.completions.create.return_value = mock_response
-        
-        result = self.llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
-        
-        self.assertEqual(result['match'], 'Yes')
-        self.assertEqual(result['confidence'], 0.85)
-        self.assertIn('Good match', result['reasoning'])
-    
-    @patch('ai_doc_gen.utils.llm.client')
-    def test_match_sections_with_llm_no_openai(self, mock_client):
-        """Test behavior when OpenAI is not available for matching."""
-        mock_client.chat.completions.create.side_effect = Exception("API error")
-        
-        result = self.llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
-        
-        expected = {'match': 'No', 'confidence': 0.0, 'reasoning': 'Error: API error'}
-        self.assertEqual(result, expected)
-    
-    def test_extract_synonyms_from_text(self):
-        """Test synonym extraction from text."""
-        text = 'Here are some synonyms: "PoE", "Power over Ethernet", and [802.3af, IEEE 802.3af]'
-        
-        synonyms = self.llm_util._extract_synonyms_from_text(text)
-        
-        expected = ['PoE', 'Power over Ethernet', '802.3af', 'IEEE 802.3af']
-        self.assertEqual(set(synonyms), set(expected))
-    
-    def test_parse_match_response(self):
-        """Test parsing of match response."""
-        text = '''
+def make_response(content):
+    """Minimal stand-in for an OpenAI chat completion carrying ``content``."""
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def llm_util(tmp_path):
+    """LLM utility with a private cache directory per test."""
+    return LLMUtility(cache_dir=str(tmp_path))
+
+
+@pytest.fixture
+def mock_client():
+    """Patched OpenAI client; set ``chat.completions.create`` per test."""
+    with patch('ai_doc_gen.utils.llm.client') as client:
+        yield client
+
+
+@pytest.mark.parametrize("content,expected", [
+    # Well-formed JSON array
+    ('["PoE", "Power over Ethernet", "802.3af"]', {"PoE", "Power over Ethernet", "802.3af"}),
+    # Comma-separated prose falls back to text extraction
+    ('PoE, Power over Ethernet, 802.3af', {"PoE", "Power over Ethernet", "802.3af"}),
+    # Array wrapped in prose
+    ('Sure:\n["PoE", "Power over Ethernet"]', {"PoE", "Power over Ethernet"}),
+], ids=["json", "comma-fallback", "wrapped-json"])
+def test_get_synonyms_from_llm(llm_util, mock_client, content, expected):
+    """Test synonym generation across the reply formats the model produces."""
+    mock_client.chat.completions.create.return_value = make_response(content)
+
+    synonyms = llm_util.get_synonyms_from_llm("Power over Ethernet")
+
+    # Acronym expansion merges results through a set, so order is not defined
+    assert set(synonyms) == expected
+    mock_client.chat.completions.create.assert_called_once()
+
+
+def test_get_synonyms_from_llm_no_openai(llm_util, mock_client):
+    """Test behavior when OpenAI is not available."""
+    mock_client.chat.completions.create.side_effect = Exception("API error")
+
+    assert llm_util.get_synonyms_from_llm("Power over Ethernet") == []
+
+
+def test_get_synonyms_from_llm_cached(llm_util, mock_client):
+    """Test that cached synonyms are used."""
+    cache_data = {
+        'title': 'Power over Ethernet',
+        'synonyms': ['PoE', 'Power over Ethernet'],
+        'model': 'gpt-4',
+        'temperature': 0.2,
+        'prompt': 'test prompt'
+    }
+    cache_path = os.path.join(llm_util.cache_dir, llm_util._generate_cache_key("Power over Ethernet"))
+    assert llm_util._save_cache_safely(cache_path, cache_data)
+
+    # Should use cache and not call OpenAI
+    synonyms = llm_util.get_synonyms_from_llm("Power over Ethernet")
+
+    assert synonyms == ['PoE', 'Power over Ethernet']
+    mock_client.chat.completions.create.assert_not_called()
+
+
+def test_get_synonyms_from_llm_memory_cache(llm_util, mock_client):
+    """Test that repeat lookups, including case variants, skip the LLM and disk."""
+    mock_client.chat.completions.create.return_value = make_response('["PoE", "802.3af"]')
+
+    first = llm_util.get_synonyms_from_llm("Power over Ethernet")
+    with patch.object(llm_util, '_load_cache_safely') as mock_load:
+        second = llm_util.get_synonyms_from_llm("power  over ETHERNET")
+        mock_load.assert_not_called()
+
+    assert second == first
+    mock_client.chat.completions.create.assert_called_once()
+    assert llm_util.get_cache_stats()['cache_hits'] == 1
+
+
+def test_get_synonyms_from_llm_errors_not_cached(llm_util, mock_client):
+    """Test that failed LLM calls are retried rather than memoized."""
+    mock_client.chat.completions.create.side_effect = Exception("API error")
+    assert llm_util.get_synonyms_from_llm("Power over Ethernet") == []
+
+    mock_client.chat.completions.create.side_effect = None
+    mock_client.chat.completions.create.return_value = make_response('["PoE"]')
+
+    assert "PoE" in llm_util.get_synonyms_from_llm("Power over Ethernet")
+    assert mock_client.chat.completions.create.call_count == 2
+
+
+def test_generate_cache_key_normalizes_title(llm_util):
+    """Test that casing and spacing variants share one cache file."""
+    key = llm_util._generate_cache_key("Power over Ethernet")
+
+    assert key == llm_util._generate_cache_key("  POWER over  ethernet ")
+    assert key != llm_util._generate_cache_key("Power over Fiber")
+    assert key.startswith("synonyms_") and key.endswith(".json")
+    assert len(key) == len("synonyms_") + 16 + len(".json")
+
+
+def test_match_sections_with_llm_memory_cache(llm_util, mock_client):
+    """Test that repeat section matches are served from memory."""
+    mock_client.chat.completions.create.return_value = make_response(
+        '{"match": "Yes", "confidence": 0.9, "reasoning": "Same"}'
+    )
+
+    first = llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
+    first['confidence'] = 0.0  # Callers mutating a result must not affect the cache
+    second = llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
+
+    assert second['confidence'] == 0.9
+    mock_client.chat.completions.create.assert_called_once()
+
+
+def test_match_sections_with_llm_success(llm_util, mock_client):
+    """Test successful section matching."""
+    mock_client.chat.completions.create.return_value = make_response('''
+    {
         "match": "Yes",
-        "confidence": 0.85,
-        "reasoning": "Good match between sections"
-        '''
-        
-        result = self.llm_util._parse_match_response(text)
-        
-        expected = {
-            'match': 'Yes',
-            'confidence': 0.85,
-            'reasoning': 'Good match between sections'
-        }
-        self.assertEqual(result, expected)
-
-
-class TestLLMUtilityIntegration(unittest.TestCase):
-    """Integration tests for LLM utility."""
-    
-    def test_synonym_dictionary_structure(self):
-        """Test that synonym dictionary has correct structure."""
-        # This would test the actual synonym generation script
-        # For now, just test the expected structure
-        expected_structure = {
-            'metadata': {
-                'template_path': str,
-                'total_sections': int,
-                'generation_timestamp': str,
-                'model': str,
-                'temperature': float
-            },
-            'synonyms': dict
-        }
-        
-        # This is a structure test - actual generation would be tested separately
-        self.assertTrue(True)  # Placeholder
+        "confidence": 0.95,
+        "reasoning": "PoE is the standard abbreviation for Power over Ethernet"
+    }
+    ''')
+
+    result = llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
+
+    assert result == {
+        'match': 'Yes',
+        'confidence': 0.95,
+        'reasoning': 'PoE is the standard abbreviation for Power over Ethernet'
+    }
+
+
+def test_match_sections_batch_single_call(llm_util, mock_client):
+    """Test that a batch of pairs is matched with one LLM call and cached."""
+    mock_client.chat.completions.create.return_value = make_response(json.dumps([
+        {"match": "Yes", "confidence": 0.95, "reasoning": "Abbreviation"},
+        {"match": "No", "confidence": 0.1, "reasoning": "Different topics"},
+    ]))
+
+    pairs = [("Power over Ethernet", "PoE"), ("Power over Ethernet", "Network Configuration")]
+    results = llm_util.match_sections_batch(pairs)
+
+    assert [r['match'] for r in results] == ["Yes", "No"]
+    assert results[0]['confidence'] == 0.95
+    mock_client.chat.completions.create.assert_called_once()
+
+    # Batched results answer later single-pair lookups without another call
+    assert llm_util.match_sections_with_llm(*pairs[1])['match'] == "No"
+    mock_client.chat.completions.create.assert_called_once()
+
+
+def test_match_sections_batch_misaligned_reply(llm_util, mock_client):
+    """Test that a reply with the wrong number of results falls back per pair."""
+    batch_response = make_response('[{"match": "Yes", "confidence": 0.9, "reasoning": "x"}]')
+    single_response = make_response('{"match": "Partial", "confidence": 0.6, "reasoning": "y"}')
+    mock_client.chat.completions.create.side_effect = [batch_response, single_response, single_response]
+
+    results = llm_util.match_sections_batch([("A", "B"), ("C", "D")])
+
+    assert [r['match'] for r in results] == ["Partial", "Partial"]
+    assert mock_client.chat.completions.create.call_count == 3
+
+
+def test_match_sections_with_llm_parse_fallback(llm_util, mock_client):
+    """Test fallback parsing for match response."""
+    mock_client.chat.completions.create.return_value = make_response('''
+    Match: Yes
+    Confidence: 0.85
+    Reasoning: Good match
+    ''')
+
+    result = llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
+
+    assert result['match'] == 'Yes'
+    assert result['confidence'] == 0.85
+    assert 'Good match' in result['reasoning']
+
+
+def test_match_sections_with_llm_no_openai(llm_util, mock_client):
+    """Test behavior when OpenAI is not available for matching."""
+    mock_client.chat.completions.create.side_effect = Exception("API error")
+
+    result = llm_util.match_sections_with_llm("Power over Ethernet", "PoE")
+
+    assert result == {'match': 'No', 'confidence': 0.0, 'reasoning': 'Error: API error'}
+
+
+def test_extract_synonyms_from_text(llm_util):
+    """Test synonym extraction from text."""
+    text = 'Here are some synonyms: "PoE", "Power over Ethernet", and [802.3af, IEEE 802.3af]'
+
+    synonyms = llm_util._extract_synonyms_from_text(text)
+
+    assert set(synonyms) == {'PoE', 'Power over Ethernet', '802.3af', 'IEEE 802.3af'}
+
+
+@pytest.mark.parametrize("content,expected", [
+    ('[" PoE ", "802.3af", 3, ""]', ["PoE", "802.3af"]),
+    ('Here you go:\n["PoE", "Power over Ethernet"]\nHope it helps', ["PoE", "Power over Ethernet"]),
+    ('{"synonyms": ["PoE"]}', None),
+    ('PoE, Power over Ethernet', None),
+], ids=["cleans-items", "wrapped", "object", "plain-text"])
+def test_parse_synonym_list(llm_util, content, expected):
+    """Test JSON array parsing of synonym replies."""
+    assert llm_util._parse_synonym_list(content) == expected
+
+
+def test_parse_synonym_list_never_executes_reply(llm_util):
+    """Test that code-like replies are parsed as data, never evaluated."""
+    with patch('os.system') as mock_system:
+        result = llm_util._parse_synonym_list("__import__('os').system('echo pwned')")
+    assert result is None
+    mock_system.assert_not_called()
+
+
+def test_parse_match_response(llm_util):
+    """Test parsing of match response."""
+    text = '''
+    "match": "Yes",
+    "confidence": 0.85,
+    "reasoning": "Good match between sections"
+    '''
+
+    result = llm_util._parse_match_response(text)
+
+    assert result == {
+        'match': 'Yes',
+        'confidence': 0.85,
+        'reasoning': 'Good match between sections'
+    }
+
+
+def test_synonym_dictionary_structure():
+    """Test that synonym dictionary has correct structure."""
+    # This would test the actual synonym generation script
+    # For now, just test the expected structure
+    expected_structure = {
+        'metadata': {
+            'template_path': str,
+            'total_sections': int,
+            'generation_timestamp': str,
+            'model': str,
+            'temperature': float
+        },
+        'synonyms': dict
+    }
+
+    # This is a structure test - actual generation would be tested separately
+    assert expected_structure
 
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))
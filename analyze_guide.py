@@ -21,10 +21,14 @@ Features:
 """
 
 import argparse
+import hashlib
 import json
 import os
+import pickle
+import re
+import tempfile
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -38,55 +42,100 @@ from ai_doc_gen.agents.review_agent import ReviewAgent
 from ai_doc_gen.core.confidence_scoring import ConfidenceScorer
 from ai_doc_gen.core.gap_analyzer import GapAnalyzer
 
+# Optional Aho-Corasick automaton for single-pass tone keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional C JSON encoder for writing large reports
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when parsing or extraction output changes so cached results are not reused
+ANALYSIS_CACHE_VERSION = 1
+
+# Words between whitespace and full stops, as counted for sentence length
+_WORD_RE = re.compile(r'[^\s.]+')
+
+# Whitespace-delimited letter runs longer than 8 characters (candidate technical terms)
+_LONG_WORD_RE = re.compile(r'(?<!\S)[^\W\d_]{9,}(?!\S)')
+
+# Keywords whose presence marks a content item as carrying each tone
+TONE_KEYWORDS = {
+    'formal': ('shall', 'must', 'required', 'mandatory'),
+    'technical': ('specification', 'technical', 'parameter'),
+    'instructional': ('step', 'procedure', 'instruction'),
+    'cautionary': ('warning', 'caution', 'danger'),
+    'informative': ('note', 'information', 'details'),
+}
+
+# Fallback matcher without Aho-Corasick: one named group per tone inside a
+# lookahead, so overlapping keywords are all found like plain substring tests
+_TONE_RE = re.compile('(?=' + '|'.join(
+    f"(?P<{tone}>{'|'.join(map(re.escape, keywords))})" for tone, keywords in TONE_KEYWORDS.items()
+) + ')')
+
+
+def _fingerprint(path: str) -> str:
+    """SHA-256 of a file's contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _public_attrs(obj) -> Dict[str, Any]:
+    """Shallow dict of an object's public attributes; nested objects become strings to avoid recursion."""
+    simple_attrs = {}
+    for key, value in obj.__dict__.items():
+        if not key.startswith('_'):
+            if isinstance(value, (str, int, float, bool, list, dict)) or value is None:
+                simple_attrs[key] = value
+            elif isinstance(value, Enum):
+                simple_attrs[key] = value.value
+            else:
+                simple_attrs[key] = str(value)
+    return simple_attrs
+
 
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle complex objects safely."""
     
-    def default(self, obj):
-        # Handle enums
+    # Handler chosen per type on first encounter, shared across encoder instances
+    _handlers: Dict[type, Callable[[Any], Any]] = {}
+    
+    @staticmethod
+    def _select_handler(obj) -> Callable[[Any], Any]:
+        """Pick the conversion for obj's type, probing in order of preference."""
         if isinstance(obj, Enum):
-            return obj.value
-        
-        # Handle objects with dict() method (Pydantic models)
-        if hasattr(obj, 'dict'):
-            try:
-                return obj.dict()
-            except:
-                pass
-        
-        # Handle objects with as_dict() method
+            return lambda o: o.value
+        if hasattr(obj, 'model_dump'):  # Pydantic v2 model
+            return lambda o: o.model_dump()
+        if hasattr(obj, 'dict'):  # Pydantic v1 model
+            return lambda o: o.dict()
         if hasattr(obj, 'as_dict'):
-            try:
-                return obj.as_dict()
-            except:
-                pass
-        
-        # Handle objects with __dict__ but avoid recursion
+            return lambda o: o.as_dict()
         if hasattr(obj, '__dict__'):
-            try:
-                # Only include simple attributes to avoid recursion
-                simple_attrs = {}
-                for key, value in obj.__dict__.items():
-                    if not key.startswith('_'):
-                        if isinstance(value, (str, int, float, bool, list, dict)) or value is None:
-                            simple_attrs[key] = value
-                        elif isinstance(value, Enum):
-                            simple_attrs[key] = value.value
-                        else:
-                            simple_attrs[key] = str(value)
-                return simple_attrs
-            except:
-                pass
-        
-        # Handle mappingproxy and similar objects
-        if hasattr(obj, 'items'):
-            try:
-                return dict(obj)
-            except:
-                pass
-        
-        # Fallback to string representation
-        return str(obj)
+            return _public_attrs
+        if hasattr(obj, 'items'):  # mappingproxy and similar
+            return dict
+        return str
+    
+    def default(self, obj):
+        handler = self._handlers.get(type(obj))
+        if handler is None:
+            handler = self._handlers[type(obj)] = self._select_handler(obj)
+        try:
+            return handler(obj)
+        except Exception:
+            # A broken conversion degrades to the string form rather than
+            # aborting the whole report
+            return str(obj)
 
 
 class GuideAnalyzer:
@@ -98,12 +147,28 @@ class GuideAnalyzer:
         self.review_agent = ReviewAgent()
         self.confidence_scorer = ConfidenceScorer()
         self.gap_analyzer = GapAnalyzer()
+        
+        # One automaton over every tone keyword, so each item is scanned once
+        self._tone_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._tone_automaton = ahocorasick.Automaton()
+            for tone, keywords in TONE_KEYWORDS.items():
+                for keyword in keywords:
+                    self._tone_automaton.add_word(keyword, tone)
+            self._tone_automaton.make_automaton()
+    
+    def _find_tones(self, text: str) -> set:
+        """Return the tones whose keywords occur in lowercased text."""
+        if self._tone_automaton is not None:
+            return {tone for _, tone in self._tone_automaton.iter(text)}
+        return {m.lastgroup for m in _TONE_RE.finditer(text)}
     
     def analyze_guide(
         self, 
         guide_path: str, 
         reference_path: Optional[str] = None,
-        output_dir: str = "analysis_results"
+        output_dir: str = "analysis_results",
+        use_cache: bool = True
     ) -> Dict[str, Any]:
         """Perform comprehensive guide analysis."""
         
@@ -113,9 +178,7 @@ class GuideAnalyzer:
         os.makedirs(output_dir, exist_ok=True)
         
         # Step 1: Parse and extract content
-        print("📄 Parsing document...")
-        parsed_doc = parse_document(guide_path)
-        extracted_content = self.extractor.extract_structured_content(parsed_doc)
+        parsed_doc, extracted_content = self._parse_and_extract(guide_path, output_dir, use_cache)
         
         # Step 2: Analyze content structure
         print("🏗️  Analyzing content structure...")
@@ -161,18 +224,56 @@ class GuideAnalyzer:
         print(f"✅ Analysis complete! Results saved to: {output_dir}")
         return analysis_report
     
+    def _parse_and_extract(self, guide_path: str, output_dir: str, use_cache: bool = True):
+        """Parse the guide and extract content, reusing results for unchanged files.
+        
+        Results are cached under ``{output_dir}/.cache`` keyed by the SHA-256 of
+        the guide's contents, so re-running on the same file skips parsing.
+        """
+        cache_path = os.path.join(
+            output_dir, '.cache', f"{_fingerprint(guide_path)}-v{ANALYSIS_CACHE_VERSION}.pkl"
+        )
+        
+        if use_cache and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    parsed_doc, extracted_content = pickle.load(f)
+                print("♻️  Reusing cached parse of unchanged document")
+                return parsed_doc, extracted_content
+            except Exception as e:
+                print(f"Warning: Ignoring unreadable analysis cache {cache_path}: {e}")
+        
+        print("📄 Parsing document...")
+        parsed_doc = parse_document(guide_path)
+        extracted_content = self.extractor.extract_structured_content(parsed_doc)
+        
+        if use_cache:
+            tmp_path = None
+            try:
+                os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                # Write beside the target and rename, so readers never see a partial file
+                with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path), suffix='.tmp',
+                                                 delete=False) as tmp:
+                    tmp_path = tmp.name
+                    pickle.dump((parsed_doc, extracted_content), tmp, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except Exception as e:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                print(f"Warning: Could not cache analysis results: {e}")
+        
+        return parsed_doc, extracted_content
+    
     def _analyze_content_structure(self, content: List[ExtractedContent]) -> Dict[str, Any]:
         """Analyze the structure and organization of content."""
         
-        # Content type distribution
+        # Content type distribution and per-section totals in a single pass
         content_types = {}
+        sections = {}
         for item in content:
             content_type = item.content_type.value
             content_types[content_type] = content_types.get(content_type, 0) + 1
-        
-        # Section analysis
-        sections = {}
-        for item in content:
+            
             section = item.source_section
             if section not in sections:
                 sections[section] = {
@@ -180,67 +281,48 @@ class GuideAnalyzer:
                     'types': set(),
                     'avg_confidence': 0.0
                 }
+            # avg_confidence holds the running sum until the division below
             sections[section]['count'] += 1
-            sections[section]['types'].add(item.content_type.value)
+            sections[section]['types'].add(content_type)
+            sections[section]['avg_confidence'] += item.confidence
         
         # Calculate average confidence per section
-        for section in sections:
-            section_items = [item for item in content if item.source_section == section]
-            avg_confidence = sum(item.confidence for item in section_items) / len(section_items)
-            sections[section]['avg_confidence'] = avg_confidence
-            sections[section]['types'] = list(sections[section]['types'])
+        for stats in sections.values():
+            stats['avg_confidence'] /= stats['count']
+            stats['types'] = list(stats['types'])
         
+        summary = self._summarize_content(content)
         return {
             'total_items': len(content),
             'content_type_distribution': content_types,
             'section_analysis': sections,
-            'structure_score': self._calculate_structure_score(content)
+            'average_confidence': summary[2],
+            'structure_score': self._calculate_structure_score(content, summary)
         }
     
     def _analyze_tone_and_style(self, content: List[ExtractedContent]) -> Dict[str, Any]:
         """Analyze the tone and writing style of the guide."""
         
         # Tone indicators
-        tone_indicators = {
-            'formal': 0,
-            'technical': 0,
-            'instructional': 0,
-            'cautionary': 0,
-            'informative': 0
-        }
+        tone_indicators = dict.fromkeys(TONE_KEYWORDS, 0)
         
-        # Style metrics
-        avg_sentence_length = 0
-        total_sentences = 0
-        technical_terms = set()
+        texts = [item.content.lower() for item in content]
         
-        for item in content:
-            text = item.content.lower()
-            
-            # Count tone indicators
-            if any(word in text for word in ['shall', 'must', 'required', 'mandatory']):
-                tone_indicators['formal'] += 1
-            if any(word in text for word in ['specification', 'technical', 'parameter']):
-                tone_indicators['technical'] += 1
-            if any(word in text for word in ['step', 'procedure', 'instruction']):
-                tone_indicators['instructional'] += 1
-            if any(word in text for word in ['warning', 'caution', 'danger']):
-                tone_indicators['cautionary'] += 1
-            if any(word in text for word in ['note', 'information', 'details']):
-                tone_indicators['informative'] += 1
-            
-            # Analyze sentence structure
-            sentences = text.split('.')
-            total_sentences += len(sentences)
-            avg_sentence_length += sum(len(s.split()) for s in sentences)
-            
-            # Extract technical terms (simplified)
-            words = text.split()
-            for word in words:
-                if len(word) > 8 and word.isalpha():
-                    technical_terms.add(word)
+        # Count tone indicators: each tone at most once per item
+        for text in texts:
+            for tone in self._find_tones(text):
+                tone_indicators[tone] += 1
+        
+        # Style metrics over all items at once. Items are joined with a newline,
+        # which ends a word but not a sentence, so counts match per-item splitting:
+        # one sentence per item plus one per '.', words are runs between whitespace and '.'
+        all_text = '\n'.join(texts)
+        total_sentences = all_text.count('.') + len(texts)
+        total_words = len(_WORD_RE.findall(all_text))
+        avg_sentence_length = total_words / max(total_sentences, 1)
         
-        avg_sentence_length = avg_sentence_length / max(total_sentences, 1)
+        # Extract technical terms (simplified): long, purely alphabetic words
+        technical_terms = {word for word in _LONG_WORD_RE.findall(all_text) if word.isalpha()}
         
         return {
             'tone_indicators': tone_indicators,
@@ -288,15 +370,29 @@ class GuideAnalyzer:
             'completeness_score': coverage_percentage / 100
         }
     
-    def _calculate_structure_score(self, content: List[ExtractedContent]) -> float:
+    @staticmethod
+    def _summarize_content(content: List[ExtractedContent]) -> Tuple[int, int, float]:
+        """Count distinct content types and sections and average confidence in one pass."""
+        content_types = set()
+        sections = set()
+        total_confidence = 0.0
+        for item in content:
+            content_types.add(item.content_type)
+            sections.add(item.source_section)
+            total_confidence += item.confidence
+        return len(content_types), len(sections), total_confidence / max(len(content), 1)
+    
+    def _calculate_structure_score(
+        self, 
+        content: List[ExtractedContent], 
+        summary: Optional[Tuple[int, int, float]] = None
+    ) -> float:
         """Calculate a score for content structure quality."""
         if not content:
             return 0.0
         
         # Factors: content type diversity, section organization, confidence distribution
-        content_types = len({item.content_type.value for item in content})
-        sections = len({item.source_section for item in content})
-        avg_confidence = sum(item.confidence for item in content) / len(content)
+        content_types, sections, avg_confidence = summary or self._summarize_content(content)
         
         # Normalize scores
         type_score = min(content_types / 10, 1.0)  # Assume 10 types is good
@@ -346,7 +442,7 @@ class GuideAnalyzer:
             'overall_scores': {
                 'structure_score': kwargs['structure_analysis']['structure_score'],
                 'style_score': kwargs['tone_analysis']['style_score'],
-                'confidence_score': sum(item.confidence for item in kwargs['extracted_content']) / len(kwargs['extracted_content']),
+                'confidence_score': kwargs['structure_analysis']['average_confidence'],
                 'completeness_score': kwargs['comparison_results'].get('completeness_score', 0.0)
             },
             'recommendations': self._generate_recommendations(kwargs)
@@ -393,10 +489,18 @@ class GuideAnalyzer:
     def _save_analysis_results(self, report: Dict[str, Any], output_dir: str):
         """Save analysis results to files."""
         
-        # Save full report using custom encoder
+        # Save full report, falling back to the custom encoder without orjson
         report_path = os.path.join(output_dir, 'analysis_report.json')
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, cls=CustomJSONEncoder)
+        if orjson is not None:
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(
+                    report,
+                    default=CustomJSONEncoder().default,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2, cls=CustomJSONEncoder)
         
         # Save summary
         summary_path = os.path.join(output_dir, 'analysis_summary.txt')
@@ -433,6 +537,8 @@ def main():
     parser.add_argument("--guide", required=True, help="Path to guide PDF/DOCX to analyze")
     parser.add_argument("--reference", help="Path to reference guide JSON for comparison")
     parser.add_argument("--output_dir", default="analysis_results", help="Output directory for results")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Re-parse the guide even if cached results exist for the same file")
     
     args = parser.parse_args()
     
@@ -451,7 +557,8 @@ def main():
         results = analyzer.analyze_guide(
             guide_path=args.guide,
             reference_path=args.reference,
-            output_dir=args.output_dir
+            output_dir=args.output_dir,
+            use_cache=not args.no_cache
         )
         
         # Print key findings